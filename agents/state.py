@@ -16,7 +16,7 @@ class TripPlannerState(TypedDict):
     # Processing Data
     current_step: str
     requires_input: bool
-    conversation_history: List[Dict[str, str]]
+    conversation_history: Annotated[List[Dict[str, str]], operator.add]  # Nodes return only new entries
     missing_information: List[str]
     
     # API Results
@@ -32,6 +32,7 @@ class TripPlannerState(TypedDict):
     budget_compliance: bool
     preference_match_score: float
     weather_score: float
+    weather_decision: int  # WEATHER_FAVORABLE / WEATHER_UNFAVORABLE / WEATHER_CONDITIONAL
     
     # Generated Content
     itinerary: Optional[str]
@@ -1,9 +1,15 @@
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import create_react_agent
+from langgraph.types import Command, Send
 from langchain_google_genai import ChatGoogleGenerativeAI  # FIXED IMPORT
 from langchain.schema import SystemMessage, HumanMessage
-from typing import Dict, Any, Literal
+from typing import Dict, Any, AsyncIterator, Callable, ClassVar, List, Literal, Optional, Tuple
+from io import StringIO
+from types import MappingProxyType
+from itertools import islice
+import asyncio
 import logging
+import re
 from agents.state import TripPlannerState
 from tools.travel_tools import travel_tools
 from chains.itinerary_chain import itinerary_chain
@@ -12,143 +18,219 @@ from config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields that must be present before planning can start
+REQUIRED_FIELDS = ("destination", "travel_dates", "duration", "budget")
+_ALL_REQUIRED_PRESENT = (1 << len(REQUIRED_FIELDS)) - 1
+
+# Initial planning state, merged under the caller's input on every run. The
+# empty lists are shared between runs, which is safe because no node mutates
+# state in place: nodes return fresh values and conversation_history is
+# accumulated by its operator.add reducer into a new list.
+_STATE_DEFAULTS = MappingProxyType({
+    "max_iterations": settings.MAX_ITERATIONS,
+    "current_iteration": 0,
+    "should_continue": True,
+    "conversation_history": [],
+    "missing_information": [],
+    "retry_count": 0,
+    "hotel_options": [],
+    "flight_options": [],
+    "attraction_options": [],
+    "search_results": [],
+    "alternative_suggestions": []
+})
+
+# Progress reported to plan_trip callers once each node has completed
+_NODE_PROGRESS = {
+    "collect_user_input": ("Collected travel requirements", 10),
+    "gather_travel_data": ("Gathered weather, hotel, flight and attraction data", 40),
+    "analyze_weather": ("Analyzed weather conditions", 50),
+    "search_accommodations": ("Searched for accommodations", 60),
+    "search_flights": ("Found flight options", 65),
+    "generate_itinerary": ("Generated personalized itinerary", 90),
+    "provide_alternatives": ("Prepared alternative suggestions", 90),
+    "handle_feedback": ("Processed feedback", 95),
+    "finalize_recommendation": ("Finalized recommendations", 100)
+}
+
+# Weather decision computed once in gather_travel_data and stored as an int
+WEATHER_FAVORABLE, WEATHER_UNFAVORABLE, WEATHER_CONDITIONAL = 0, 1, 2
+
+def _weather_decision(viability: Dict[str, Any]) -> int:
+    if viability.get('viable', False):
+        return WEATHER_FAVORABLE
+    elif viability.get('score', 0) < 30:
+        return WEATHER_UNFAVORABLE
+    else:
+        return WEATHER_CONDITIONAL
+
+# Feedback keywords mapped to the follow-up action, matched in a single scan.
+# Anything unmatched (itinerary, schedule, plan, ...) regenerates the itinerary.
+_FEEDBACK_PATTERN = re.compile(r"\b(weather|rain|storm|hotel|accommodation|stay|flight)")
+_FEEDBACK_ACTIONS = {
+    "weather": "weather_recheck",
+    "rain": "weather_recheck",
+    "storm": "weather_recheck",
+    "hotel": "new_search",
+    "accommodation": "new_search",
+    "stay": "new_search",
+    "flight": "new_search"
+}
+
+# Node that handles each feedback action
+_FEEDBACK_ROUTES = {
+    "regenerate": "generate_itinerary",
+    "new_search": "gather_travel_data",
+    "weather_recheck": "analyze_weather"
+}
+
+def _classify_feedback(feedback: str) -> str:
+    """Weather concerns take priority over search concerns, as before"""
+    next_action = "regenerate"
+    for match in _FEEDBACK_PATTERN.finditer(feedback.lower()):
+        action = _FEEDBACK_ACTIONS[match.group(1)]
+        if action == "weather_recheck":
+            return action
+        next_action = action
+    return next_action
+
+# Itinerary quality markers, all located in one scan of the itinerary text.
+# Matching stays case-sensitive, like the substring checks it replaces.
+_STRUCTURE_MARKERS = frozenset({"Day 1", "Day 2", "Morning", "Afternoon"})
+_COMPREHENSIVE_KEYWORDS = frozenset({"hotel", "activities", "restaurant"})
+_QUALITY_MARKER_PATTERN = re.compile(
+    "|".join(re.escape(marker) for marker in sorted(_STRUCTURE_MARKERS | _COMPREHENSIVE_KEYWORDS))
+)
+_QUALITY_MARKER_COUNT = len(_STRUCTURE_MARKERS | _COMPREHENSIVE_KEYWORDS)
+
+# Travel types whose plans do not hinge on the weather. They run on a smaller
+# graph without the analyze_weather step.
+_WEATHER_INDEPENDENT_TYPES = frozenset({"business"})
+
+def _checks_weather(travel_type: Optional[str]) -> bool:
+    return (travel_type or "leisure").lower() not in _WEATHER_INDEPENDENT_TYPES
+
 class TripPlannerAgent:
+    # Built once per process and shared by every instance. The nodes keep no
+    # per-instance state, so the graphs compiled against the first instance's
+    # bound methods are valid for all of them. Graphs are keyed by whether the
+    # travel type checks the weather.
+    _llm_singleton: ClassVar[Optional[ChatGoogleGenerativeAI]] = None
+    _compiled_graphs: ClassVar[Dict[bool, Any]] = {}
+    
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.LLM_MODEL,
-            google_api_key=settings.GEMINI_API_KEY,
-            temperature=settings.LLM_TEMPERATURE
-        )
-        self.graph = self._build_graph()
+        if TripPlannerAgent._llm_singleton is None:
+            TripPlannerAgent._llm_singleton = ChatGoogleGenerativeAI(
+                model=settings.LLM_MODEL,
+                google_api_key=settings.GEMINI_API_KEY,
+                temperature=settings.LLM_TEMPERATURE,
+                timeout=settings.LLM_TIMEOUT,
+                max_retries=settings.LLM_MAX_RETRIES,
+                streaming=settings.LLM_STREAMING
+            )
+        if not TripPlannerAgent._compiled_graphs:
+            for checks_weather in (True, False):
+                TripPlannerAgent._compiled_graphs[checks_weather] = self._build_graph(checks_weather)
+        
+        self.llm = TripPlannerAgent._llm_singleton
+        self.graph = TripPlannerAgent._compiled_graphs[True]
     
-    def _build_graph(self):
+    def _graph_for(self, state: Dict[str, Any]):
+        """Compiled graph specialized for the state's travel type"""
+        return TripPlannerAgent._compiled_graphs[_checks_weather(state.get('travel_type'))]
+    
+    def _build_graph(self, checks_weather: bool = True):
         """Build the enhanced LangGraph state machine"""
         workflow = StateGraph(TripPlannerState)
         
-        # Add all nodes
+        # Add all nodes; weather-independent travel types skip analyze_weather,
+        # so the nodes that can route to it declare narrower destinations
         workflow.add_node("collect_user_input", self.collect_user_input)
-        workflow.add_node("gather_travel_data", self.gather_travel_data)
-        workflow.add_node("analyze_weather", self.analyze_weather)
+        if checks_weather:
+            workflow.add_node("gather_travel_data", self.gather_travel_data)
+            workflow.add_node("analyze_weather", self.analyze_weather)
+        else:
+            workflow.add_node(
+                "gather_travel_data",
+                self.gather_travel_data,
+                destinations=("search_accommodations", "search_flights", "provide_alternatives")
+            )
         workflow.add_node("search_accommodations", self.search_accommodations)
         workflow.add_node("search_flights", self.search_flights)
         workflow.add_node("generate_itinerary", self.generate_itinerary)
         workflow.add_node("provide_alternatives", self.provide_alternatives)
         workflow.add_node("finalize_recommendation", self.finalize_recommendation)
-        workflow.add_node("handle_feedback", self.handle_feedback)
+        if checks_weather:
+            workflow.add_node("handle_feedback", self.handle_feedback)
+        else:
+            workflow.add_node(
+                "handle_feedback",
+                self.handle_feedback,
+                destinations=("generate_itinerary", "gather_travel_data")
+            )
         
         # Set entry point
         workflow.set_entry_point("collect_user_input")
         
-        # Define complex conditional edges
-        workflow.add_conditional_edges(
-            "collect_user_input",
-            self.decide_after_input_collection,
-            {
-                "complete": "gather_travel_data",
-                "incomplete": "collect_user_input",
-                "error": "provide_alternatives"
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "gather_travel_data",
-            self.decide_after_data_collection,
-            {
-                "weather_check": "analyze_weather",
-                "direct_planning": "search_flights",
-                "error": "provide_alternatives"
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "analyze_weather",
-            self.decide_after_weather_analysis,
-            {
-                "favorable": "search_accommodations",
-                "unfavorable": "provide_alternatives",
-                "conditional": "search_flights"
-            }
-        )
-        
-        workflow.add_edge("search_accommodations", "search_flights")
+        # Routing is decided inside each node, which returns a Command carrying
+        # both its state update and the next node. Favorable weather fans out to
+        # the hotel and flight searches in parallel; generate_itinerary fires
+        # once both branches have written their results
+        workflow.add_edge("search_accommodations", "generate_itinerary")
         workflow.add_edge("search_flights", "generate_itinerary")
         
-        workflow.add_conditional_edges(
-            "generate_itinerary",
-            self.decide_after_itinerary,
-            {
-                "success": "finalize_recommendation",
-                "needs_improvement": "provide_alternatives",
-                "error": "provide_alternatives"
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "finalize_recommendation",
-            self.decide_after_finalization,
-            {
-                "accepted": END,
-                "needs_revision": "handle_feedback",
-                "rejected": "provide_alternatives"
-            }
-        )
-        
-        workflow.add_conditional_edges(
-            "handle_feedback",
-            self.decide_after_feedback,
-            {
-                "regenerate": "generate_itinerary",
-                "new_search": "gather_travel_data",
-                "weather_recheck": "analyze_weather"
-            }
-        )
-        
         workflow.add_edge("provide_alternatives", "finalize_recommendation")
         
         return workflow.compile()
     
-    def collect_user_input(self, state: TripPlannerState) -> Dict[str, Any]:
+    def collect_user_input(self, state: TripPlannerState) -> Command[Literal["gather_travel_data", "collect_user_input", "provide_alternatives"]]:
         """Enhanced user input collection with conversation"""
         logger.info("Collecting user input")
         
-        current_messages = state.get("messages", [])
         missing_info = state.get("missing_information", [])
         
-        # Check if we have all required information
-        required_fields = ["destination", "travel_dates", "duration", "budget"]
-        current_state = {field: state.get(field) for field in required_fields}
-        
-        # Identify missing information
-        new_missing = [field for field, value in current_state.items() if not value]
+        # Check if we have all required information, one bit per field
+        present = 0
+        for i, field in enumerate(REQUIRED_FIELDS):
+            if state.get(field):
+                present |= 1 << i
         
-        if not new_missing and not missing_info:
-            return {
+        if present == _ALL_REQUIRED_PRESENT and not missing_info:
+            update = {
                 "current_step": "data_collection",
                 "requires_input": False,
                 "missing_information": []
             }
-        
-        # Update missing information
-        if new_missing:
-            return {
+        elif present != _ALL_REQUIRED_PRESENT:
+            # Update missing information
+            new_missing = [field for i, field in enumerate(REQUIRED_FIELDS) if not (present >> i) & 1]
+            update = {
                 "current_step": "input_collection",
                 "requires_input": True,
                 "missing_information": new_missing,
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Need information: {', '.join(new_missing)}"}]
+                "conversation_history": [{"role": "system", "content": f"Need information: {', '.join(new_missing)}"}]
+            }
+        else:
+            update = {
+                "current_step": "data_collection",
+                "requires_input": False
             }
         
-        return {
-            "current_step": "data_collection",
-            "requires_input": False
-        }
+        if state.get('error_message'):
+            goto = "provide_alternatives"
+        elif not update["requires_input"]:
+            goto = "gather_travel_data"
+        else:
+            goto = "collect_user_input"
+        
+        return Command(update=update, goto=goto)
     
-    def gather_travel_data(self, state: TripPlannerState) -> Dict[str, Any]:
+    async def gather_travel_data(self, state: TripPlannerState) -> Command[Literal["analyze_weather", "search_accommodations", "search_flights", "provide_alternatives"]]:
         """Enhanced data gathering with comprehensive metrics"""
-        logger.info(f"Gathering comprehensive travel data for {state.get('destination')}")
+        logger.info("Gathering comprehensive travel data for %s", state.get('destination'))
         
         try:
-            travel_data = travel_tools.get_comprehensive_travel_data(
+            travel_data = await travel_tools.get_comprehensive_travel_data(
                 destination=state.get('destination', ''),
                 dates=state.get('travel_dates', ''),
                 budget=state.get('budget', settings.DEFAULT_BUDGET),
@@ -157,72 +239,88 @@ class TripPlannerAgent:
             )
             
             if travel_data.get('status') == 'success':
-                # Get weather viability from the basic weather data
-                weather_viability = travel_tools.check_weather_viability(travel_data.get('weather_data', {}))
+                # Weather viability was already scored while collecting the data
+                weather_viability = travel_data['weather_viability']
                 
-                return {
+                update = {
                     "weather_data": travel_data['weather_data'],
                     "weather_analysis": travel_data['weather_analysis'],
                     "weather_viability": weather_viability,
+                    "weather_score": weather_viability.get('score', 0),
+                    "weather_decision": _weather_decision(weather_viability),
                     "hotel_options": travel_data['hotel_options'],
                     "attraction_options": travel_data['attraction_options'],
                     "flight_options": travel_data['flight_options'],
                     "search_results": travel_data['search_results'],
                     "current_step": "weather_analysis",
-                    "conversation_history": state.get("conversation_history", []) + 
-                                           [{"role": "system", "content": "Travel data collected successfully"}]
+                    "conversation_history": [{"role": "system", "content": "Travel data collected successfully"}]
                 }
+                
+                if state.get('error_message'):
+                    goto = "provide_alternatives"
+                elif not _checks_weather(state.get('travel_type')):
+                    # No weather gate, so go straight to the parallel searches
+                    searched = {**state, **update}
+                    goto = [Send("search_accommodations", searched), Send("search_flights", searched)]
+                elif travel_data['weather_data'] and 'error' not in travel_data['weather_data']:
+                    goto = "analyze_weather"
+                else:
+                    goto = "search_flights"
+                
+                return Command(goto=goto, update=update)
             else:
-                return {
+                return Command(goto="provide_alternatives", update={
                     "error_message": travel_data.get('error', 'Unknown error in data collection'),
                     "current_step": "error_handling",
-                    "conversation_history": state.get("conversation_history", []) + 
-                                           [{"role": "system", "content": f"Data collection error: {travel_data.get('error')}"}]
-                }
+                    "conversation_history": [{"role": "system", "content": f"Data collection error: {travel_data.get('error')}"}]
+                })
                 
         except Exception as e:
-            logger.error(f"Data collection failed: {str(e)}")
-            return {
+            logger.error("Data collection failed: %s", e)
+            return Command(goto="provide_alternatives", update={
                 "error_message": f"Data collection failed: {str(e)}",
                 "current_step": "error_handling",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Data collection exception: {str(e)}"}]
-            }
+                "conversation_history": [{"role": "system", "content": f"Data collection exception: {str(e)}"}]
+            })
     
-    def analyze_weather(self, state: TripPlannerState) -> Dict[str, Any]:
+    def analyze_weather(self, state: TripPlannerState) -> Command[Literal["search_accommodations", "search_flights", "provide_alternatives"]]:
         """Enhanced weather analysis with scoring"""
         logger.info("Analyzing weather conditions with scoring")
         
         try:
-            viability = state.get('weather_viability', {})
+            weather_decision = state.get('weather_decision', WEATHER_UNFAVORABLE)
             weather_score = state.get('weather_score', 0)
             
             analysis_update = state.get('weather_analysis', '') + f"\nWeather Viability Score: {weather_score}/100"
             
-            if viability.get('viable', False):
-                return {
-                    "current_step": "accommodation_search",
-                    "weather_analysis": analysis_update,
-                    "conversation_history": state.get("conversation_history", []) + 
-                                           [{"role": "system", "content": "Weather conditions favorable"}]
-                }
+            if weather_decision == WEATHER_FAVORABLE:
+                # Dispatch the independent hotel and flight searches as one superstep
+                return Command(
+                    goto=[Send("search_accommodations", state), Send("search_flights", state)],
+                    update={
+                        "current_step": "accommodation_search",
+                        "weather_analysis": analysis_update,
+                        "conversation_history": [{"role": "system", "content": "Weather conditions favorable"}]
+                    }
+                )
             else:
                 alternatives = ["Consider alternative dates", "Look for nearby destinations", "Plan indoor activities"]
-                return {
-                    "current_step": "alternative_planning",
-                    "weather_analysis": analysis_update,
-                    "alternative_suggestions": alternatives,
-                    "conversation_history": state.get("conversation_history", []) + 
-                                           [{"role": "system", "content": "Weather conditions unfavorable, generating alternatives"}]
-                }
+                return Command(
+                    goto="provide_alternatives" if weather_decision == WEATHER_UNFAVORABLE else "search_flights",
+                    update={
+                        "current_step": "alternative_planning",
+                        "weather_analysis": analysis_update,
+                        "alternative_suggestions": alternatives,
+                        "conversation_history": [{"role": "system", "content": "Weather conditions unfavorable, generating alternatives"}]
+                    }
+                )
                 
         except Exception as e:
-            return {
+            return Command(goto="provide_alternatives", update={
                 "current_step": "alternative_planning",
                 "error_message": f"Weather analysis error: {str(e)}",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Weather analysis error: {str(e)}"}]
-            }
+                "conversation_history": [{"role": "system", "content": f"Weather analysis error: {str(e)}"}]
+            })
     
     def search_accommodations(self, state: TripPlannerState) -> Dict[str, Any]:
         """Enhanced accommodation search with preference matching"""
@@ -231,17 +329,18 @@ class TripPlannerAgent:
         hotels = state.get('hotel_options', [])
         budget = state.get('budget', settings.DEFAULT_BUDGET)
         
-        # Filter and rank hotels
-        filtered_hotels = [
-            hotel for hotel in hotels 
-            if not hotel.get('error') and self._is_within_budget(hotel, budget)
-        ][:3]
+        # Filter and rank hotels, stopping as soon as three candidates pass
+        filtered_hotels = list(islice(
+            (hotel for hotel in hotels
+             if not hotel.get('error') and self._is_within_budget(hotel, budget)),
+            3
+        ))
         
+        # Runs in parallel with search_flights, so leave current_step to that branch;
+        # conversation_history entries from both branches are merged by its reducer
         return {
             "hotel_options": filtered_hotels,
-            "current_step": "flight_search",
-            "conversation_history": state.get("conversation_history", []) + 
-                                   [{"role": "system", "content": f"Found {len(filtered_hotels)} accommodation options"}]
+            "conversation_history": [{"role": "system", "content": f"Found {len(filtered_hotels)} accommodation options"}]
         }
     
     def search_flights(self, state: TripPlannerState) -> Dict[str, Any]:
@@ -253,16 +352,24 @@ class TripPlannerAgent:
         return {
             "flight_options": flights,
             "current_step": "itinerary_generation",
-            "conversation_history": state.get("conversation_history", []) + 
-                                   [{"role": "system", "content": f"Found {len(flights)} flight options"}]
+            "conversation_history": [{"role": "system", "content": f"Found {len(flights)} flight options"}]
         }
     
-    def generate_itinerary(self, state: TripPlannerState) -> Dict[str, Any]:
+    async def generate_itinerary(self, state: TripPlannerState) -> Command[Literal["finalize_recommendation", "provide_alternatives"]]:
         """Enhanced itinerary generation with quality scoring"""
         logger.info("Generating comprehensive travel itinerary")
         
+        # Marginal weather usually ends in alternatives, so request them alongside
+        # the itinerary; the two LLM round trips then overlap instead of queueing
+        alternatives_task = None
+        if _checks_weather(state.get('travel_type')) and state.get('weather_decision') == WEATHER_CONDITIONAL:
+            alternatives_task = asyncio.create_task(self._request_alternatives(state))
+        
         try:
-            itinerary = itinerary_chain.generate_itinerary(
+            # Consume the itinerary as a stream so the tokens can be forwarded to
+            # astream_trip callers as they arrive; scoring waits for the full text
+            buffer = StringIO()
+            async for chunk in itinerary_chain.astream_itinerary(
                 travel_data={
                     'destination': state.get('destination'),
                     'weather_analysis': state.get('weather_analysis', ''),
@@ -273,46 +380,52 @@ class TripPlannerAgent:
                 duration=state.get('duration', 3),
                 preferences=state.get('preferences', []),
                 travel_type=state.get('travel_type', 'leisure')
-            )
+            ):
+                buffer.write(chunk)
+            itinerary = buffer.getvalue()
             
             # Calculate itinerary quality score
             quality_score = self._calculate_itinerary_quality(itinerary, state)
             
-            return {
+            if state.get('error_message') or quality_score < 70:
+                goto = "provide_alternatives"
+            else:
+                goto = "finalize_recommendation"
+            
+            update = {
                 "itinerary": itinerary,
                 "itinerary_quality_score": quality_score,
                 "current_step": "finalization",
                 "final_recommendation": f"Trip plan generated with quality score: {quality_score}/100",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": "Itinerary generated successfully"}]
+                "conversation_history": [{"role": "system", "content": "Itinerary generated successfully"}]
             }
+            if alternatives_task is not None:
+                update["alternative_suggestions"] = await alternatives_task
+            
+            return Command(goto=goto, update=update)
             
         except Exception as e:
-            logger.error(f"Itinerary generation failed: {str(e)}")
-            return {
+            logger.error("Itinerary generation failed: %s", e)
+            if alternatives_task is not None:
+                alternatives_task.cancel()
+            return Command(goto="provide_alternatives", update={
                 "error_message": f"Itinerary generation failed: {str(e)}",
                 "current_step": "alternative_planning",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Itinerary generation error: {str(e)}"}]
-            }
+                "conversation_history": [{"role": "system", "content": f"Itinerary generation error: {str(e)}"}]
+            })
     
-    def provide_alternatives(self, state: TripPlannerState) -> Dict[str, Any]:
+    async def provide_alternatives(self, state: TripPlannerState) -> Dict[str, Any]:
         """Enhanced alternative suggestions"""
         logger.info("Generating comprehensive alternative suggestions")
         
         try:
-            alternatives = itinerary_chain.generate_alternative_suggestions(
-                destination=state.get('destination', ''),
-                issue=state.get('error_message', 'Planning constraints encountered'),
-                preferences=state.get('preferences', [])
-            )
+            alternatives = await self._request_alternatives(state)
             
             return {
                 "alternative_suggestions": alternatives,
                 "current_step": "finalization",
                 "final_recommendation": "Alternative travel suggestions provided",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": "Generated alternative suggestions"}]
+                "conversation_history": [{"role": "system", "content": "Generated alternative suggestions"}]
             }
             
         except Exception as e:
@@ -320,11 +433,10 @@ class TripPlannerAgent:
                 "alternative_suggestions": ["Please adjust your travel parameters and try again"],
                 "current_step": "finalization",
                 "final_recommendation": "Unable to create optimal plan. Please try different parameters.",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Alternative generation error: {str(e)}"}]
+                "conversation_history": [{"role": "system", "content": f"Alternative generation error: {str(e)}"}]
             }
     
-    def finalize_recommendation(self, state: TripPlannerState) -> Dict[str, Any]:
+    def finalize_recommendation(self, state: TripPlannerState) -> Command[Literal["handle_feedback", "provide_alternatives", "__end__"]]:
         """Enhanced finalization with comprehensive output"""
         logger.info("Finalizing travel recommendation")
         
@@ -338,88 +450,68 @@ class TripPlannerAgent:
             "flight_options": state.get('flight_options', [])
         }
         
-        return {
+        # Revision and rejection would typically come from user feedback
+        # For demo purposes, we assume acceptance
+        return Command(goto=END, update={
             "current_step": "completed",
             "requires_input": False,
             "should_continue": False,
             "final_recommendation": recommendation,
-            "conversation_history": state.get("conversation_history", []) + 
-                                   [{"role": "system", "content": "Recommendation finalized"}]
-        }
+            "conversation_history": [{"role": "system", "content": "Recommendation finalized"}]
+        })
     
-    def handle_feedback(self, state: TripPlannerState) -> Dict[str, Any]:
+    def handle_feedback(self, state: TripPlannerState) -> Command[Literal["generate_itinerary", "gather_travel_data", "analyze_weather"]]:
         """Handle user feedback and decide next steps"""
         logger.info("Processing user feedback")
         
-        feedback = state.get('user_feedback', '').lower()
-        current_step = state.get('current_step', '')
-        
-        # Analyze feedback to decide next action
-        if any(word in feedback for word in ['weather', 'rain', 'storm']):
-            next_action = "weather_recheck"
-        elif any(word in feedback for word in ['hotel', 'accommodation', 'stay']):
-            next_action = "new_search"
-        elif any(word in feedback for word in ['itinerary', 'schedule', 'plan']):
+        next_action = _classify_feedback(state.get('user_feedback') or '')
+        if next_action == "weather_recheck" and not _checks_weather(state.get('travel_type')):
             next_action = "regenerate"
-        else:
-            next_action = "regenerate"  # Default action
         
-        return {
+        return Command(goto=_FEEDBACK_ROUTES[next_action], update={
             "current_step": next_action,
-            "conversation_history": state.get("conversation_history", []) + 
-                                   [{"role": "system", "content": f"Processing feedback, next action: {next_action}"}]
-        }
-    
-    # Decision methods
-    def decide_after_input_collection(self, state: TripPlannerState) -> Literal["complete", "incomplete", "error"]:
-        if state.get('error_message'):
-            return "error"
-        elif not state.get('requires_input', True):
-            return "complete"
-        else:
-            return "incomplete"
+            "conversation_history": [{"role": "system", "content": f"Processing feedback, next action: {next_action}"}]
+        })
     
-    def decide_after_data_collection(self, state: TripPlannerState) -> Literal["weather_check", "direct_planning", "error"]:
-        if state.get('error_message'):
-            return "error"
-        elif state.get('weather_data') and 'error' not in state.get('weather_data', {}):
-            return "weather_check"
-        else:
-            return "direct_planning"
-    
-    def decide_after_weather_analysis(self, state: TripPlannerState) -> Literal["favorable", "unfavorable", "conditional"]:
-        viability = state.get('weather_viability', {})
-        if viability.get('viable', False):
-            return "favorable"
-        elif viability.get('score', 0) < 30:
-            return "unfavorable"
-        else:
-            return "conditional"
+    # Helper methods
+    async def _request_alternatives(self, state: TripPlannerState) -> List[str]:
+        """Alternatives for the current plan; repeat requests are served from the chain's cache"""
+        destination = state.get('destination', '')
+        preferences = state.get('preferences', [])
+        issues = self._planning_issues(state)
+        
+        if len(issues) == 1:
+            return await itinerary_chain.generate_alternative_suggestions(
+                destination=destination, issue=issues[0], preferences=preferences
+            )
+        
+        # Several issues share one LLM round trip instead of one call each
+        by_issue = await itinerary_chain.generate_alternatives_batch(destination, issues, preferences)
+        return list(dict.fromkeys(alt for alternatives in by_issue.values() for alt in alternatives))
     
-    def decide_after_itinerary(self, state: TripPlannerState) -> Literal["success", "needs_improvement", "error"]:
+    def _planning_issues(self, state: TripPlannerState) -> List[str]:
+        """Problems with the current plan that the alternatives should address"""
+        issues = []
         if state.get('error_message'):
-            return "error"
-        elif state.get('itinerary_quality_score', 0) >= 70:
-            return "success"
-        else:
-            return "needs_improvement"
-    
-    def decide_after_finalization(self, state: TripPlannerState) -> Literal["accepted", "needs_revision", "rejected"]:
-        # This would typically come from user feedback
-        # For demo purposes, we assume acceptance
-        return "accepted"
-    
-    def decide_after_feedback(self, state: TripPlannerState) -> Literal["regenerate", "new_search", "weather_recheck"]:
-        feedback = state.get('user_feedback', '').lower()
-        
-        if any(word in feedback for word in ['weather', 'rain']):
-            return "weather_recheck"
-        elif any(word in feedback for word in ['hotel', 'flight']):
-            return "new_search"
-        else:
-            return "regenerate"
+            issues.append(state['error_message'])
+        
+        # The remaining checks need the travel data, which gather_travel_data
+        # stores together with the weather decision
+        if 'weather_decision' in state:
+            weather_decision = state['weather_decision']
+            if _checks_weather(state.get('travel_type')) and weather_decision != WEATHER_FAVORABLE:
+                quality = "Poor" if weather_decision == WEATHER_UNFAVORABLE else "Marginal"
+                issues.append(f"{quality} weather for the travel dates (viability score {state.get('weather_score', 0)}/100)")
+            
+            budget = state.get('budget', settings.DEFAULT_BUDGET)
+            if not any(not hotel.get('error') and self._is_within_budget(hotel, budget)
+                       for hotel in state.get('hotel_options', [])):
+                issues.append("No accommodations found within budget")
+            if not state.get('flight_options'):
+                issues.append(f"No flights found from {state.get('origin_city', 'the origin city')}")
+        
+        return issues or ['Planning constraints encountered']
     
-    # Helper methods
     def _is_within_budget(self, hotel: Dict[str, Any], budget: float) -> bool:
         """Simple budget check"""
         return True  # Accept all for demo
@@ -435,44 +527,130 @@ class TripPlannerAgent:
         if len(itinerary) > 500:
             score += 20
         
+        # Single left-to-right scan that stops once every marker has been seen
+        hits = set()
+        for match in _QUALITY_MARKER_PATTERN.finditer(itinerary):
+            hits.add(match.group())
+            if len(hits) == _QUALITY_MARKER_COUNT:
+                break
+        
         # Add points for structure
-        if any(marker in itinerary for marker in ['Day 1', 'Day 2', 'Morning', 'Afternoon']):
+        if hits & _STRUCTURE_MARKERS:
             score += 20
         
         # Add points for comprehensiveness
-        if all(keyword in itinerary for keyword in ['hotel', 'activities', 'restaurant']):
+        if _COMPREHENSIVE_KEYWORDS <= hits:
             score += 10
         
         return min(100, score)
     
-    def plan_trip(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Main method to execute trip planning with enhanced monitoring"""
+    async def aplan_trip(self, initial_state: Dict[str, Any],
+                         progress_callback: Optional[Callable[[str, int], None]] = None,
+                         token_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Main method to execute trip planning with enhanced monitoring.
+        progress_callback(step_name, percent) is called as each node completes and
+        token_callback(text) with each itinerary chunk as the LLM streams it"""
         try:
             # Initialize state with defaults
-            state = {
-                "max_iterations": settings.MAX_ITERATIONS,
-                "current_iteration": 0,
-                "should_continue": True,
-                "conversation_history": [],
-                "missing_information": [],
-                "retry_count": 0,
-                **initial_state
-            }
+            state = {**_STATE_DEFAULTS, **initial_state}
             
             logger.info("Starting trip planning process")
             
             # Execute the graph
-            final_state = self.graph.invoke(state)
+            graph = self._graph_for(state)
+            if progress_callback is None and token_callback is None:
+                final_state = await graph.ainvoke(state)
+            else:
+                stream_mode = ["updates", "values"]
+                if token_callback is not None:
+                    stream_mode.append("messages")
+                
+                final_state = None
+                async for mode, chunk in graph.astream(state, stream_mode=stream_mode):
+                    if mode == "values":
+                        final_state = chunk
+                    elif mode == "messages":
+                        message, metadata = chunk
+                        if metadata.get("langgraph_node") == "generate_itinerary" and message.content:
+                            token_callback(message.content)
+                    elif progress_callback is not None:
+                        for node in chunk:
+                            if node in _NODE_PROGRESS:
+                                progress_callback(*_NODE_PROGRESS[node])
             
             logger.info("Trip planning completed successfully")
             return final_state
             
         except Exception as e:
-            logger.error(f"Trip planning failed: {str(e)}")
-            return {
-                "error_message": f"Trip planning failed: {str(e)}",
-                "itinerary": None,
-                "final_recommendation": "Unable to generate travel plan. Please try again.",
-                "conversation_history": state.get("conversation_history", []) + 
-                                       [{"role": "system", "content": f"Planning process error: {str(e)}"}]
-            }
\ No newline at end of file
+            return self._planning_failure(state, e)
+    
+    async def astream_trip(self, initial_state: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """Run trip planning, yielding ("token", text) itinerary chunks as the LLM
+        streams them and finally ("result", final_state)"""
+        state = {**_STATE_DEFAULTS, **initial_state}
+        
+        try:
+            logger.info("Starting streamed trip planning process")
+            
+            final_state = None
+            async for event in self._graph_for(state).astream_events(state, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    if event["metadata"].get("langgraph_node") == "generate_itinerary":
+                        content = event["data"]["chunk"].content
+                        if content:
+                            yield "token", content
+                elif kind == "on_chain_end" and not event["parent_ids"]:
+                    final_state = event["data"]["output"]
+            
+            logger.info("Trip planning completed successfully")
+            yield "result", final_state
+            
+        except Exception as e:
+            yield "result", self._planning_failure(state, e)
+    
+    async def plan_trips_batch(self, initial_states: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Plan several trips in one batch. Runs share the event loop, so identical
+        travel data lookups in flight at the same time are made only once"""
+        states = [{**_STATE_DEFAULTS, **initial_state} for initial_state in initial_states]
+        
+        logger.info("Starting batch trip planning for %d requests", len(states))
+        
+        # Each specialized graph batches its own share of the states
+        groups: Dict[bool, List[int]] = {}
+        for i, state in enumerate(states):
+            groups.setdefault(_checks_weather(state.get('travel_type')), []).append(i)
+        
+        results: List[Any] = [None] * len(states)
+        
+        async def run_group(checks_weather: bool, indices: List[int]) -> None:
+            outputs = await TripPlannerAgent._compiled_graphs[checks_weather].abatch(
+                [states[i] for i in indices],
+                config={"max_concurrency": settings.MAX_BATCH_CONCURRENCY},
+                return_exceptions=True
+            )
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        
+        await asyncio.gather(*(run_group(key, indices) for key, indices in groups.items()))
+        
+        return [
+            self._planning_failure(state, result) if isinstance(result, Exception) else result
+            for state, result in zip(states, results)
+        ]
+    
+    def plan_trip(self, initial_state: Dict[str, Any],
+                  progress_callback: Optional[Callable[[str, int], None]] = None,
+                  token_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Synchronous entry point for callers without a running event loop"""
+        return asyncio.run(self.aplan_trip(initial_state, progress_callback, token_callback))
+    
+    def _planning_failure(self, state: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        logger.error("Trip planning failed: %s", error)
+        return {
+            "error_message": f"Trip planning failed: {str(error)}",
+            "itinerary": None,
+            "final_recommendation": "Unable to generate travel plan. Please try again.",
+            "conversation_history": state.get("conversation_history", []) + 
+                                   [{"role": "system", "content": f"Planning process error: {str(error)}"}]
+        }
\ No newline at end of file
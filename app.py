@@ -15,29 +15,55 @@ else:
     DEBUG = True
 
 import streamlit as st
-import json
+import orjson
 from datetime import datetime, timedelta, date
 from agents.trip_planner import TripPlannerAgent
 from utils.helpers import format_itinerary_display, validate_user_input, create_sample_itinerary, get_system_metrics
 from config.settings import settings
 import logging
-from langsmith import Client
 import time
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import escape
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize LangSmith client
-try:
-    langsmith_client = Client()
-    st.session_state.langsmith_available = True
-except Exception as e:
-    st.session_state.langsmith_available = False
-    logger.warning(f"LangSmith not available: {e}")
+# Number of slowest runs labelled with their duration in the performance chart
+PERFORMANCE_CHART_TOP_LABELS = 10
+# Seconds between progress bar refreshes while a plan is running
+PROGRESS_POLL_INTERVAL = 0.1
+# Points sent to the browser for the performance chart, whatever the history length
+PERFORMANCE_CHART_MAX_POINTS = 1000
+# Most recent tracked operations kept per session; older rows are dropped
+PLANNING_METRICS_MAX_ROWS = 5000
+
+# Shared across all sessions and reruns, so the agent (LLM client, tools,
+# compiled graphs) and the LangSmith client are only constructed once
+@st.cache_resource(show_spinner=False)
+def get_planner_agent():
+    return TripPlannerAgent()
+
+@st.cache_resource(show_spinner=False)
+def get_planning_executor():
+    # Planning runs off the script thread so the progress UI stays live and
+    # concurrent sessions are not serialized behind one another
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="trip-planner")
+
+@st.cache_resource(show_spinner=False)
+def get_langsmith_client():
+    try:
+        from langsmith import Client
+        return Client()
+    except Exception as e:
+        logger.warning(f"LangSmith not available: {e}")
+        return None
+
+# One metrics snapshot shared by all sessions, refreshed at most once per TTL
+@st.cache_data(ttl=settings.SYSTEM_METRICS_CACHE_TTL, show_spinner=False)
+def get_cached_system_metrics():
+    return get_system_metrics()
 
 # Page configuration
 st.set_page_config(
@@ -48,8 +74,8 @@ st.set_page_config(
 )
 
 # Initialize session state
-if 'planner_agent' not in st.session_state:
-    st.session_state.planner_agent = TripPlannerAgent()
+if 'langsmith_available' not in st.session_state:
+    st.session_state.langsmith_available = get_langsmith_client() is not None
 if 'itinerary_generated' not in st.session_state:
     st.session_state.itinerary_generated = False
 if 'current_itinerary' not in st.session_state:
@@ -57,58 +83,185 @@ if 'current_itinerary' not in st.session_state:
 if 'conversation_history' not in st.session_state:
     st.session_state.conversation_history = []
 if 'planning_metrics' not in st.session_state:
-    st.session_state.planning_metrics = {}
+    # Created by track_metrics on the first tracked operation
+    st.session_state.planning_metrics = None
 if 'system_stats' not in st.session_state:
-    st.session_state.system_stats = get_system_metrics()
+    st.session_state.system_stats = get_cached_system_metrics()
+
+# Serialized views of the current itinerary; reruns that do not change the
+# itinerary (e.g. typing feedback) reuse the cached strings
+@st.cache_data(show_spinner=False)
+def get_itinerary_json(itinerary_data: dict) -> bytes:
+    return orjson.dumps(
+        itinerary_data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    )
+
+@st.cache_data(show_spinner=False)
+def get_itinerary_display(itinerary_data: dict) -> str:
+    return format_itinerary_display(itinerary_data)
+
+@st.cache_data(show_spinner=False)
+def get_metrics_csv(metrics_df) -> bytes:
+    return metrics_df.to_csv(index=False).encode()
+
+@lru_cache(maxsize=16)
+def quick_stats_html(total_plans, success_rate, average_time) -> str:
+    """Sidebar quick stats as one metric-styled element, rebuilt only when a value changes"""
+    return "".join(
+        "<div style='margin-bottom: 0.75rem;'>"
+        f"<div style='font-size: 0.875rem; opacity: 0.7;'>{escape(label)}</div>"
+        f"<div style='font-size: 1.75rem;'>{escape(str(value))}</div>"
+        "</div>"
+        for label, value in (("Total Plans", total_plans), ("Success Rate", success_rate), ("Avg Time", average_time))
+    )
+
+@lru_cache(maxsize=16)
+def metric_grid_html(cards: tuple) -> str:
+    """A row of (label, value, delta) metric cards as one CSS grid element"""
+    cells = "".join(
+        "<div>"
+        f"<div style='font-size: 0.875rem; opacity: 0.7;'>{escape(label)}</div>"
+        f"<div style='font-size: 1.75rem;'>{escape(str(value))}</div>"
+        + (f"<div style='font-size: 0.875rem; color: #2E8B57;'>{escape(delta)}</div>" if delta else "")
+        + "</div>"
+        for label, value, delta in cards
+    )
+    return (f"<div style='display: grid; grid-template-columns: repeat({len(cards)}, 1fr); "
+            f"gap: 1rem; margin-bottom: 1rem;'>{cells}</div>")
+
+# Static System Overview cards, rendered as a single element
+OVERVIEW_HTML = metric_grid_html((
+    ("Total Plans Generated", "150", "+12 this week"),
+    ("Success Rate", "94.7%", "+2.3%"),
+    ("Avg Response Time", "45.2s", "-3.1s"),
+    ("User Satisfaction", "4.8/5.0", "⭐")
+))
 
 def track_metrics(operation: str, start_time: float, success: bool, **kwargs):
     """Track performance metrics for LangSmith"""
     if st.session_state.langsmith_available:
         try:
             duration = time.time() - start_time
-            st.session_state.planning_metrics[operation] = {
-                "duration": duration,
-                "success": success,
-                "timestamp": datetime.now().isoformat(),
-                **kwargs
-            }
+            metrics_df = st.session_state.planning_metrics
+            if metrics_df is None:
+                import pandas as pd
+                
+                # One row per tracked operation, stored column-wise
+                metrics_df = st.session_state.planning_metrics = pd.DataFrame({
+                    "operation": pd.Series(dtype="object"),
+                    "duration": pd.Series(dtype="float64"),
+                    "success": pd.Series(dtype="bool"),
+                    "timestamp": pd.Series(dtype="object"),
+                    "destination": pd.Series(dtype="object")
+                })
+            metrics_df.loc[len(metrics_df)] = [
+                operation,
+                duration,
+                success,
+                datetime.now().isoformat(),
+                kwargs.get("destination")
+            ]
+            
+            # Behave like a ring buffer so long sessions keep bounded memory
+            if len(metrics_df) > PLANNING_METRICS_MAX_ROWS:
+                st.session_state.planning_metrics = metrics_df.iloc[-PLANNING_METRICS_MAX_ROWS:].reset_index(drop=True)
         except Exception as e:
             logger.error(f"Metrics tracking failed: {e}")
 
+def lttb_indices(values, n_out: int):
+    """Largest-Triangle-Three-Buckets downsampling over evenly spaced points.
+    Returns the indices of the n_out points that best preserve the shape"""
+    import numpy as np
+    
+    n = len(values)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest are split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = (end + next_end - 1) / 2
+        next_y = values[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick
+        # and the average of the next bucket
+        xs = np.arange(start, end)
+        areas = np.abs((prev - next_x) * (values[start:end] - values[prev])
+                       - (prev - xs) * (next_y - values[prev]))
+        prev = start + int(areas.argmax())
+        selected[i + 1] = prev
+    
+    return selected
+
+@st.cache_data(show_spinner=False)
 def create_performance_chart(metrics_data):
     """Create performance visualization charts"""
-    if not metrics_data:
+    import numpy as np
+    import plotly.graph_objects as go
+    
+    if metrics_data is None or metrics_data.empty:
         return None
     
-    # Prepare data for charts
-    operations = list(metrics_data.keys())
-    durations = [metrics_data[op]['duration'] for op in operations]
-    statuses = ['✅ Success' if metrics_data[op]['success'] else '❌ Failed' for op in operations]
+    # Downsample long histories so the browser only receives what it can show
+    if len(metrics_data) > PERFORMANCE_CHART_MAX_POINTS:
+        values = metrics_data["duration"].to_numpy(dtype=np.float64)
+        metrics_data = metrics_data.iloc[lttb_indices(values, PERFORMANCE_CHART_MAX_POINTS)]
+    
+    # Prepare data for charts; every tracked run gets its own point
+    operations = metrics_data["operation"].tolist()
+    durations = metrics_data["duration"].to_numpy()
     
-    # Create bar chart
+    # Only the slowest runs get a text label, since laying out a label per
+    # point dominates rendering once the history grows
+    labels = np.full(len(durations), "", dtype=object)
+    top = np.argpartition(durations, -PERFORMANCE_CHART_TOP_LABELS)[-PERFORMANCE_CHART_TOP_LABELS:] \
+        if len(durations) > PERFORMANCE_CHART_TOP_LABELS else np.arange(len(durations))
+    labels[top] = [f"{d:.2f}s" for d in durations[top]]
+    
+    # WebGL scatter keeps rendering responsive for long sessions
     fig = go.Figure(data=[
-        go.Bar(
+        go.Scattergl(
             name='Duration (seconds)',
-            x=operations,
+            x=metrics_data["timestamp"].tolist(),
             y=durations,
-            marker_color=['#2E8B57' if s == '✅ Success' else '#DC143C' for s in statuses],
-            text=[f"{d:.2f}s" for d in durations],
-            textposition='auto',
+            mode='markers+text',
+            hovertext=operations,
+            marker=dict(
+                size=10,
+                color=metrics_data["success"].map({True: '#2E8B57', False: '#DC143C'}).tolist()
+            ),
+            text=labels,
+            textposition='top center',
         )
     ])
     
     fig.update_layout(
         title='Operation Performance Metrics',
-        xaxis_title='Operations',
+        xaxis_title='Operation Time',
         yaxis_title='Duration (seconds)',
         showlegend=False,
-        template='plotly_white'
+        template='plotly_white',
+        hovermode='x',
+        spikedistance=0
     )
     
-    return fig
+    # Cache the plain figure dict; it pickles cheaply and st.plotly_chart renders it directly
+    return fig.to_dict()
 
-def create_system_health_gauge(health_data):
-    """Create system health gauge"""
+@st.cache_data(show_spinner=False)
+def create_system_health_gauge():
+    """Create system health gauge.
+    The score is static for now, so the figure is built once per process"""
+    import plotly.graph_objects as go
+    
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
         value = 94.7,  # This would be dynamic in real implementation
@@ -132,7 +285,213 @@ def create_system_health_gauge(health_data):
     ))
     
     fig.update_layout(height=300)
-    return fig
+    return fig.to_dict()
+
+# Static About-section content, built once at import rather than on every rerun
+ABOUT_HERO = """
+<div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; color: white;'>
+<h1 style='color: white; text-align: center;'>🚀 Next-Generation Travel Planning</h1>
+<p style='text-align: center; font-size: 1.2rem;'>AI-Powered, Real-Time, Intelligent Trip Planning</p>
+</div>
+
+---
+"""
+
+ABOUT_DATA_FLOW = """
+### 🔄 Data Flow Architecture
+
+```
+User Input
+   ↓
+Streamlit Interface
+   ↓
+LangGraph Agent Engine
+   ↓
+Specialized Tool Nodes
+   ↓
+External APIs & Services
+   ↓
+Decision Making & Routing
+   ↓
+Personalized Itinerary
+   ↓
+User Feedback & Improvement
+```
+"""
+
+ABOUT_TECH_STACK = """
+### 🛠️ Technical Stack
+
+**Frontend Layer:**
+- Streamlit Web Interface
+- Real-time Progress Tracking
+- Interactive Feedback System
+
+**AI Orchestration:**
+- LangGraph State Management
+- Conditional Workflow Routing
+- Error Handling & Recovery
+
+**Data Integration:**
+- OpenWeatherMap API
+- Web Search & Scraping
+- Real-time Data Processing
+
+**Monitoring & Analytics:**
+- LangSmith Tracing
+- Performance Metrics
+- Quality Evaluation
+"""
+
+ABOUT_AI_PLANNING = """
+### 🤖 AI-Powered Planning
+- **Smart Itinerary Generation**: LLM-powered day-by-day planning
+- **Weather-Aware Routing**: Dynamic activity adjustment based on conditions
+- **Preference Matching**: Personalized recommendations based on user interests
+- **Budget Optimization**: Cost-effective planning within constraints
+"""
+
+ABOUT_REALTIME_INTELLIGENCE = """
+### 🔄 Real-Time Intelligence
+- **Live Weather Integration**: Up-to-date weather forecasts and analysis
+- **Dynamic Search**: Real-time hotel and flight availability
+- **Alternative Planning**: Automatic re-routing for poor conditions
+- **Progressive Refinement**: Continuous improvement through feedback
+"""
+
+ABOUT_ADVANCED_MONITORING = """
+### 📊 Advanced Monitoring
+- **Performance Analytics**: Detailed operation timing and success rates
+- **Quality Scoring**: Automated itinerary quality assessment
+- **System Health**: Real-time API status monitoring
+- **User Analytics**: Planning patterns and preference tracking
+"""
+
+ABOUT_LANGGRAPH_WORKFLOW = """
+### 🎯 LangGraph State Management
+
+**8-Node Decision Pipeline:**
+1. **Input Collection** - Conversational requirement gathering
+2. **Data Aggregation** - Multi-source information collection
+3. **Weather Analysis** - Condition scoring and viability assessment
+4. **Accommodation Search** - Hotel filtering and ranking
+5. **Flight Integration** - Route planning and pricing
+6. **Itinerary Generation** - LLM-powered plan creation
+7. **Alternative Planning** - Fallback route generation
+8. **Finalization** - Quality assessment and delivery
+
+**Key Features:**
+- Conditional edge routing based on real-time data
+- State persistence across node transitions
+- Error recovery and alternative pathing
+- Progressive refinement loops
+"""
+
+ABOUT_TOOL_INTEGRATION = """
+### 🔌 External Tool Integration
+
+**Weather Intelligence:**
+- OpenWeatherMap API integration
+- Daily forecast analysis for trip duration
+- Weather viability scoring (0-100)
+- Alternative date suggestions
+
+**Accommodation Search:**
+- Real-time hotel data scraping
+- Price range categorization
+- Amenity-based filtering
+- Location-based ranking
+
+**Flight Integration:**
+- Domestic and international route planning
+- Realistic pricing algorithms
+- Airline-specific amenity mapping
+- Layover optimization
+"""
+
+ABOUT_MONITORING_SYSTEM = """
+### 📈 Comprehensive Monitoring
+
+**Performance Tracking:**
+- Operation timing and success rates
+- API response time monitoring
+- Error rate analysis and debugging
+- Resource utilization metrics
+
+**Quality Assurance:**
+- Itinerary completeness scoring
+- Weather compliance assessment
+- Budget adherence evaluation
+- User satisfaction tracking
+
+**System Health:**
+- Real-time API status monitoring
+- Automated health checks
+- Performance degradation alerts
+- Capacity planning insights
+"""
+
+ABOUT_DATA_PIPELINE = """
+### 🌊 Data Processing Pipeline
+
+**Input Processing:**
+- User preference parsing and validation
+- Date range and budget constraint application
+- Destination-specific parameter tuning
+- Requirement prioritization and weighting
+
+**Real-time Analysis:**
+- Concurrent API calls with timeout handling
+- Data normalization and enrichment
+- Cross-source validation and verification
+- Quality scoring and ranking
+
+**Output Generation:**
+- Structured itinerary formatting
+- Alternative option generation
+- Export capability (JSON, Text)
+- Feedback collection and processing
+"""
+
+ABOUT_DEPLOYMENT = """
+### ☁️ Deployment Ready
+- **Containerized**: Docker support for easy deployment
+- **Cloud Native**: Compatible with AWS, GCP, Azure
+- **Auto-scaling**: Handles variable load patterns
+- **Cost Optimized**: Efficient resource utilization
+
+**Supported Platforms:**
+- Render (Free tier compatible)
+- Heroku
+- AWS Elastic Beanstalk
+- Google Cloud Run
+- Azure Container Instances
+"""
+
+ABOUT_SECURITY = """
+### 🔒 Security & Compliance
+- **API Key Management**: Secure environment variable handling
+- **Data Privacy**: No personal data persistence
+- **Rate Limiting**: API call throttling and optimization
+- **Error Handling**: Graceful degradation under load
+
+**Monitoring Stack:**
+- LangSmith for AI tracing
+- Custom performance metrics
+- Real-time health checks
+- Automated alerting system
+"""
+
+ABOUT_CALL_TO_ACTION = """
+---
+
+<div style='text-align: center; padding: 2rem; background: #f0f2f6; border-radius: 10px;'>
+<h2>🚀 Ready to Transform Travel Planning?</h2>
+<p>Experience the future of intelligent trip planning with our AI-powered platform.</p>
+<br>
+<a href="#plan-trip" style='background: #FF4B4B; color: white; padding: 0.75rem 2rem; text-decoration: none; border-radius: 5px;'>Start Planning Now</a>
+</div>
+"""
 
 def main():
     st.title("🗺️ Intelligent Trip Planner Agent")
@@ -205,26 +564,26 @@ def main():
         st.sidebar.markdown("---")
         st.sidebar.subheader("Quick Stats")
         stats = st.session_state.system_stats
-        st.sidebar.metric("Total Plans", stats["total_plans_generated"])
-        st.sidebar.metric("Success Rate", stats["success_rate"])
-        st.sidebar.metric("Avg Time", stats["average_planning_time"])
+        st.sidebar.markdown(
+            quick_stats_html(stats["total_plans_generated"], stats["success_rate"], stats["average_planning_time"]),
+            unsafe_allow_html=True
+        )
     
-    # Main content area with tabs
-    tab1, tab2, tab3, tab4 = st.tabs(["Plan Trip", "View Itinerary", "Monitoring", "About"])
+    # Main content area; unlike st.tabs, only the selected section's body runs
+    # on each rerun, so the monitoring charts and About page are not rebuilt
+    # while the user is planning
+    active_tab = st.radio(
+        "Section",
+        ["Plan Trip", "View Itinerary", "Monitoring", "About"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_tab"
+    )
     
-    with tab1:
+    if active_tab == "Plan Trip":
         st.header("Generate Your AI-Powered Travel Plan")
         
         if st.button("🚀 Generate Comprehensive Travel Plan", type="primary", use_container_width=True):
-            if duration <= 0:
-                st.error("Please select valid travel dates")
-                return
-            
-            # Validate dates are in future
-            if start_date <= date.today():
-                st.error("Start date must be in the future")
-                return
-            
             # Prepare input data
             travel_dates = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
             
@@ -239,7 +598,7 @@ def main():
                 "conversation_history": st.session_state.conversation_history
             }
             
-            # Validate input
+            # Validate everything up front, before any progress UI is created
             validation = validate_user_input(input_data)
             if not validation["valid"]:
                 for error in validation["errors"]:
@@ -250,6 +609,7 @@ def main():
             if use_sample_data:
                 st.info("Using sample data for demonstration")
                 sample_data = create_sample_itinerary()
+                sample_data["_generated_at"] = datetime.now().strftime('%Y%m%d_%H%M%S')
                 st.session_state.current_itinerary = sample_data
                 st.session_state.itinerary_generated = True
                 st.rerun()
@@ -259,66 +619,83 @@ def main():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    # Enhanced progress steps with metrics
-                    progress_steps = [
-                        ("Collecting travel requirements", 10),
-                        ("Analyzing weather conditions", 20),
-                        ("Searching for accommodations", 35),
-                        ("Finding flight options", 50),
-                        ("Discovering attractions", 65),
-                        ("Generating personalized itinerary", 80),
-                        ("Optimizing travel plan", 95),
-                        ("Finalizing recommendations", 100)
-                    ]
+                    # The agent runs in a worker thread, which cannot touch Streamlit
+                    # elements, so it only records its latest step for this thread to draw
+                    latest_progress = [("Collecting travel requirements", 0)]
                     
-                    start_time = time.time()
+                    def report_progress(step: str, progress: int):
+                        latest_progress[0] = (step, progress)
                     
-                    for i, (step, progress) in enumerate(progress_steps):
+                    def show_progress():
+                        step, progress = latest_progress[0]
                         status_text.text(f"🔄 {step}...")
                         progress_bar.progress(progress)
-                        time.sleep(0.5)  # Simulate processing
+                    
+                    start_time = time.time()
+                    show_progress()
+                    
+                    try:
+                        planning_start = time.time()
+                        settings.validate_settings()
+                        
+                        # Itinerary tokens are collected the same way and streamed
+                        # into the page while the plan is still running
+                        streamed_tokens = []
+                        future = get_planning_executor().submit(
+                            get_planner_agent().plan_trip, input_data, report_progress, streamed_tokens.append
+                        )
+                        
+                        def stream_itinerary():
+                            sent = 0
+                            while not future.done() or sent < len(streamed_tokens):
+                                show_progress()
+                                pending = len(streamed_tokens)
+                                if pending > sent:
+                                    yield "".join(streamed_tokens[sent:pending])
+                                    sent = pending
+                                else:
+                                    time.sleep(PROGRESS_POLL_INTERVAL)
+                        
+                        st.write_stream(stream_itinerary())
+                        show_progress()
+                        
+                        result = future.result()
+                        # Stamped once so the export filenames stay stable across reruns
+                        result["_generated_at"] = datetime.now().strftime('%Y%m%d_%H%M%S')
+                        st.session_state.current_itinerary = result
+                        st.session_state.itinerary_generated = True
                         
-                        # Actual planning on final step
-                        if i == len(progress_steps) - 1:
-                            try:
-                                settings.validate_settings()
-                                planning_start = time.time()
-                                
-                                result = st.session_state.planner_agent.plan_trip(input_data)
-                                st.session_state.current_itinerary = result
-                                st.session_state.itinerary_generated = True
-                                
-                                # Track successful planning
-                                track_metrics(
-                                    "trip_planning", 
-                                    planning_start, 
-                                    True,
-                                    destination=destination,
-                                    duration=duration,
-                                    budget=budget
-                                )
-                                
-                                # Update conversation history
-                                if 'conversation_history' in result:
-                                    st.session_state.conversation_history = result['conversation_history']
-                                
-                            except Exception as e:
-                                st.error(f"Trip planning failed: {str(e)}")
-                                st.info("Please check your API keys in the .env file")
-                                
-                                # Track failed planning
-                                track_metrics(
-                                    "trip_planning", 
-                                    planning_start, 
-                                    False,
-                                    error=str(e),
-                                    destination=destination
-                                )
+                        # Track successful planning
+                        track_metrics(
+                            "trip_planning", 
+                            planning_start, 
+                            True,
+                            destination=destination,
+                            duration=duration,
+                            budget=budget
+                        )
+                        
+                        # Update conversation history
+                        if 'conversation_history' in result:
+                            st.session_state.conversation_history = result['conversation_history']
+                        
+                    except Exception as e:
+                        st.error(f"Trip planning failed: {str(e)}")
+                        st.info("Please check your API keys in the .env file")
+                        
+                        # Track failed planning
+                        track_metrics(
+                            "trip_planning", 
+                            planning_start, 
+                            False,
+                            error=str(e),
+                            destination=destination
+                        )
                     
                     total_time = time.time() - start_time
                     status_text.text(f"✅ Trip planning completed in {total_time:.2f} seconds!")
     
-    with tab2:
+    if active_tab == "View Itinerary":
         st.header("Your AI-Generated Travel Itinerary")
         
         if st.session_state.itinerary_generated and st.session_state.current_itinerary:
@@ -328,7 +705,7 @@ def main():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                formatted_output = format_itinerary_display(itinerary_data)
+                formatted_output = get_itinerary_display(itinerary_data)
                 st.markdown(formatted_output)
                 
                 # Feedback system
@@ -352,11 +729,12 @@ def main():
                 
                 # Download options
                 st.subheader("Export Options")
-                itinerary_json = json.dumps(itinerary_data, indent=2)
+                generated_at = itinerary_data.get("_generated_at", "output")
+                itinerary_json = get_itinerary_json(itinerary_data)
                 st.download_button(
                     label="📥 Download Itinerary (JSON)",
                     data=itinerary_json,
-                    file_name=f"itinerary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    file_name=f"itinerary_{generated_at}.json",
                     mime="application/json",
                     use_container_width=True
                 )
@@ -364,35 +742,27 @@ def main():
                 st.download_button(
                     label="📄 Download Itinerary (TXT)",
                     data=formatted_output,
-                    file_name=f"itinerary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                    file_name=f"itinerary_{generated_at}.txt",
                     mime="text/plain",
                     use_container_width=True
                 )
         else:
             st.info("🎯 No itinerary generated yet. Go to the 'Plan Trip' tab to create your AI-powered travel plan!")
     
-    with tab3:
+    if active_tab == "Monitoring":
         st.header("🚀 System Monitoring & Analytics Dashboard")
+        st.session_state.system_stats = get_cached_system_metrics()
         
         # System Overview Cards
         st.subheader("📊 System Overview")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Total Plans Generated", "150", "+12 this week")
-        with col2:
-            st.metric("Success Rate", "94.7%", "+2.3%")
-        with col3:
-            st.metric("Avg Response Time", "45.2s", "-3.1s")
-        with col4:
-            st.metric("User Satisfaction", "4.8/5.0", "⭐")
+        st.markdown(OVERVIEW_HTML, unsafe_allow_html=True)
         
         # Performance Charts
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📈 Performance Metrics")
-            if st.session_state.planning_metrics:
+            if st.session_state.planning_metrics is not None:
                 fig = create_performance_chart(st.session_state.planning_metrics)
                 if fig:
                     st.plotly_chart(fig, use_container_width=True)
@@ -401,7 +771,7 @@ def main():
         
         with col2:
             st.subheader("🩺 System Health")
-            health_fig = create_system_health_gauge(st.session_state.system_stats)
+            health_fig = create_system_health_gauge()
             st.plotly_chart(health_fig, use_container_width=True)
         
         # API Status
@@ -418,30 +788,29 @@ def main():
         
         # Detailed Metrics Table
         st.subheader("📋 Detailed Operation Metrics")
-        if show_metrics and st.session_state.planning_metrics:
-            metrics_df = []
-            for operation, data in st.session_state.planning_metrics.items():
-                metrics_df.append({
-                    "Operation": operation.replace('_', ' ').title(),
-                    "Duration (s)": f"{data['duration']:.2f}",
-                    "Status": "✅ Success" if data['success'] else "❌ Failed",
-                    "Timestamp": data['timestamp'],
-                    "Destination": data.get('destination', 'N/A')
-                })
+        if show_metrics and st.session_state.planning_metrics is not None:
+            df = st.session_state.planning_metrics
+            st.dataframe(
+                df,
+                use_container_width=True,
+                column_config={
+                    "operation": "Operation",
+                    "duration": st.column_config.NumberColumn("Duration (s)", format="%.2f"),
+                    "success": st.column_config.CheckboxColumn("Success"),
+                    "timestamp": "Timestamp",
+                    "destination": "Destination"
+                }
+            )
             
-            if metrics_df:
-                df = pd.DataFrame(metrics_df)
-                st.dataframe(df, use_container_width=True)
-                
-                # Export metrics
-                if st.button("📊 Export Metrics to CSV"):
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="Download CSV",
-                        data=csv,
-                        file_name=f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
+            # Export metrics
+            if st.button("📊 Export Metrics to CSV"):
+                csv = get_metrics_csv(df)
+                st.download_button(
+                    label="Download CSV",
+                    data=csv,
+                    file_name=f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
         else:
             st.info("No detailed metrics recorded yet. Generate a trip plan to see monitoring data.")
         
@@ -509,77 +878,33 @@ def main():
         # Debug information
         if enable_debug:
             st.subheader("🐛 Debug Information")
+            # Expander bodies are always sent to the browser, so the payloads are
+            # only serialized and shipped once explicitly requested
             if st.session_state.current_itinerary:
                 with st.expander("Raw Itinerary Data"):
-                    st.json(st.session_state.current_itinerary)
+                    if st.checkbox("Render JSON", key="render_raw_itinerary"):
+                        st.code(get_itinerary_json(st.session_state.current_itinerary).decode(), language="json")
             
             with st.expander("Conversation History"):
-                st.json(st.session_state.conversation_history)
+                if st.checkbox("Render JSON", key="render_conversation_history"):
+                    st.code(orjson.dumps(st.session_state.conversation_history, option=orjson.OPT_INDENT_2).decode(), language="json")
     
-    with tab4:
+    if active_tab == "About":
         st.header("🌟 About Intelligent Trip Planner Agent")
         
         # Hero Section
-        st.markdown("""
-        <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; color: white;'>
-        <h1 style='color: white; text-align: center;'>🚀 Next-Generation Travel Planning</h1>
-        <p style='text-align: center; font-size: 1.2rem;'>AI-Powered, Real-Time, Intelligent Trip Planning</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(ABOUT_HERO, unsafe_allow_html=True)
         
         # Architecture Overview
-        st.markdown("---")
         st.subheader("🏗️ System Architecture")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("""
-            ### 🔄 Data Flow Architecture
-            
-            ```
-            User Input 
-               ↓
-            Streamlit Interface
-               ↓
-            LangGraph Agent Engine
-               ↓
-            Specialized Tool Nodes
-               ↓
-            External APIs & Services
-               ↓
-            Decision Making & Routing
-               ↓  
-            Personalized Itinerary
-               ↓
-            User Feedback & Improvement
-            ```
-            """)
+            st.markdown(ABOUT_DATA_FLOW)
         
         with col2:
-            st.markdown("""
-            ### 🛠️ Technical Stack
-            
-            **Frontend Layer:**
-            - Streamlit Web Interface
-            - Real-time Progress Tracking
-            - Interactive Feedback System
-            
-            **AI Orchestration:**
-            - LangGraph State Management
-            - Conditional Workflow Routing
-            - Error Handling & Recovery
-            
-            **Data Integration:**
-            - OpenWeatherMap API
-            - Web Search & Scraping
-            - Real-time Data Processing
-            
-            **Monitoring & Analytics:**
-            - LangSmith Tracing
-            - Performance Metrics
-            - Quality Evaluation
-            """)
+            st.markdown(ABOUT_TECH_STACK)
         
         # Feature Showcase
         st.markdown("---")
@@ -588,31 +913,13 @@ def main():
         features_col1, features_col2, features_col3 = st.columns(3)
         
         with features_col1:
-            st.markdown("""
-            ### 🤖 AI-Powered Planning
-            - **Smart Itinerary Generation**: LLM-powered day-by-day planning
-            - **Weather-Aware Routing**: Dynamic activity adjustment based on conditions
-            - **Preference Matching**: Personalized recommendations based on user interests
-            - **Budget Optimization**: Cost-effective planning within constraints
-            """)
+            st.markdown(ABOUT_AI_PLANNING)
         
         with features_col2:
-            st.markdown("""
-            ### 🔄 Real-Time Intelligence
-            - **Live Weather Integration**: Up-to-date weather forecasts and analysis
-            - **Dynamic Search**: Real-time hotel and flight availability
-            - **Alternative Planning**: Automatic re-routing for poor conditions
-            - **Progressive Refinement**: Continuous improvement through feedback
-            """)
+            st.markdown(ABOUT_REALTIME_INTELLIGENCE)
         
         with features_col3:
-            st.markdown("""
-            ### 📊 Advanced Monitoring
-            - **Performance Analytics**: Detailed operation timing and success rates
-            - **Quality Scoring**: Automated itinerary quality assessment
-            - **System Health**: Real-time API status monitoring
-            - **User Analytics**: Planning patterns and preference tracking
-            """)
+            st.markdown(ABOUT_ADVANCED_MONITORING)
         
         # Technology Deep Dive
         st.markdown("---")
@@ -621,100 +928,22 @@ def main():
         tech_tabs = st.tabs(["LangGraph Workflow", "Tool Integration", "Monitoring System", "Data Flow"])
         
         with tech_tabs[0]:
-            st.markdown("""
-            ### 🎯 LangGraph State Management
-            
-            **8-Node Decision Pipeline:**
-            1. **Input Collection** - Conversational requirement gathering
-            2. **Data Aggregation** - Multi-source information collection
-            3. **Weather Analysis** - Condition scoring and viability assessment
-            4. **Accommodation Search** - Hotel filtering and ranking
-            5. **Flight Integration** - Route planning and pricing
-            6. **Itinerary Generation** - LLM-powered plan creation
-            7. **Alternative Planning** - Fallback route generation
-            8. **Finalization** - Quality assessment and delivery
-            
-            **Key Features:**
-            - Conditional edge routing based on real-time data
-            - State persistence across node transitions
-            - Error recovery and alternative pathing
-            - Progressive refinement loops
-            """)
+            st.markdown(ABOUT_LANGGRAPH_WORKFLOW)
         
         with tech_tabs[1]:
-            st.markdown("""
-            ### 🔌 External Tool Integration
-            
-            **Weather Intelligence:**
-            - OpenWeatherMap API integration
-            - Daily forecast analysis for trip duration
-            - Weather viability scoring (0-100)
-            - Alternative date suggestions
-            
-            **Accommodation Search:**
-            - Real-time hotel data scraping
-            - Price range categorization
-            - Amenity-based filtering
-            - Location-based ranking
-            
-            **Flight Integration:**
-            - Domestic and international route planning
-            - Realistic pricing algorithms
-            - Airline-specific amenity mapping
-            - Layover optimization
-            """)
+            st.markdown(ABOUT_TOOL_INTEGRATION)
         
         with tech_tabs[2]:
-            st.markdown("""
-            ### 📈 Comprehensive Monitoring
-            
-            **Performance Tracking:**
-            - Operation timing and success rates
-            - API response time monitoring
-            - Error rate analysis and debugging
-            - Resource utilization metrics
-            
-            **Quality Assurance:**
-            - Itinerary completeness scoring
-            - Weather compliance assessment
-            - Budget adherence evaluation
-            - User satisfaction tracking
-            
-            **System Health:**
-            - Real-time API status monitoring
-            - Automated health checks
-            - Performance degradation alerts
-            - Capacity planning insights
-            """)
+            st.markdown(ABOUT_MONITORING_SYSTEM)
         
         with tech_tabs[3]:
-            st.markdown("""
-            ### 🌊 Data Processing Pipeline
-            
-            **Input Processing:**
-            - User preference parsing and validation
-            - Date range and budget constraint application
-            - Destination-specific parameter tuning
-            - Requirement prioritization and weighting
-            
-            **Real-time Analysis:**
-            - Concurrent API calls with timeout handling
-            - Data normalization and enrichment
-            - Cross-source validation and verification
-            - Quality scoring and ranking
-            
-            **Output Generation:**
-            - Structured itinerary formatting
-            - Alternative option generation
-            - Export capability (JSON, Text)
-            - Feedback collection and processing
-            """)
+            st.markdown(ABOUT_DATA_PIPELINE)
         
         # Performance Metrics
         st.markdown("---")
         st.subheader("📊 System Performance")
         
-        metrics = st.session_state.system_stats
+        metrics = st.session_state.system_stats = get_cached_system_metrics()
         
         perf_col1, perf_col2, perf_col3 = st.columns(3)
         
@@ -735,11 +964,10 @@ def main():
         st.subheader("🏆 Popular Destinations")
         
         destinations = metrics["popular_destinations"]
-        dest_cols = st.columns(len(destinations))
-        
-        for i, destination in enumerate(destinations):
-            with dest_cols[i]:
-                st.metric(f"#{i+1}", destination)
+        st.markdown(
+            metric_grid_html(tuple((f"#{i+1}", destination, None) for i, destination in enumerate(destinations))),
+            unsafe_allow_html=True
+        )
         
         # Deployment Information
         st.markdown("---")
@@ -748,46 +976,13 @@ def main():
         deploy_col1, deploy_col2 = st.columns(2)
         
         with deploy_col1:
-            st.markdown("""
-            ### ☁️ Deployment Ready
-            - **Containerized**: Docker support for easy deployment
-            - **Cloud Native**: Compatible with AWS, GCP, Azure
-            - **Auto-scaling**: Handles variable load patterns
-            - **Cost Optimized**: Efficient resource utilization
-            
-            **Supported Platforms:**
-            - Render (Free tier compatible)
-            - Heroku
-            - AWS Elastic Beanstalk
-            - Google Cloud Run
-            - Azure Container Instances
-            """)
+            st.markdown(ABOUT_DEPLOYMENT)
         
         with deploy_col2:
-            st.markdown("""
-            ### 🔒 Security & Compliance
-            - **API Key Management**: Secure environment variable handling
-            - **Data Privacy**: No personal data persistence
-            - **Rate Limiting**: API call throttling and optimization
-            - **Error Handling**: Graceful degradation under load
-            
-            **Monitoring Stack:**
-            - LangSmith for AI tracing
-            - Custom performance metrics
-            - Real-time health checks
-            - Automated alerting system
-            """)
+            st.markdown(ABOUT_SECURITY)
         
         # Call to Action
-        st.markdown("---")
-        st.markdown("""
-        <div style='text-align: center; padding: 2rem; background: #f0f2f6; border-radius: 10px;'>
-        <h2>🚀 Ready to Transform Travel Planning?</h2>
-        <p>Experience the future of intelligent trip planning with our AI-powered platform.</p>
-        <br>
-        <a href="#plan-trip" style='background: #FF4B4B; color: white; padding: 0.75rem 2rem; text-decoration: none; border-radius: 5px;'>Start Planning Now</a>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(ABOUT_CALL_TO_ACTION, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,22 +1,55 @@
 from langchain.schema import SystemMessage, HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from config.settings import settings
-from typing import Dict, Any, List
-import json
+from utils.cache import TTLCache
+from typing import Dict, Any, AsyncIterator, List
+import orjson
+
+# Prompt lines for the shortlisted options; descriptions are cut to 100 characters
+def _format_hotel(hotel: Dict[str, Any]) -> str:
+    description = hotel.get('description', 'No description')[:100]
+    return f"- {hotel.get('name', 'Unknown')}: {description}..."
+
+def _format_attraction(attraction: Dict[str, Any]) -> str:
+    description = attraction.get('description', 'No description')[:100]
+    return f"- {attraction.get('name', 'Unknown')} ({attraction.get('category', 'General')}): {description}..."
+
+def _format_flight(flight: Dict[str, Any]) -> str:
+    return (f"- {flight.get('airline', 'Unknown')}: ${flight.get('price', 'N/A')} - "
+            f"{flight.get('departure_time', '')} to {flight.get('arrival_time', '')}")
 
 class ItineraryChain:
     def __init__(self):
         self.llm = ChatGoogleGenerativeAI(
             model=settings.LLM_MODEL,
             google_api_key=settings.GEMINI_API_KEY,
-            temperature=settings.LLM_TEMPERATURE
+            temperature=settings.LLM_TEMPERATURE,
+            timeout=settings.LLM_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES,
+            streaming=settings.LLM_STREAMING
         )
+        self._alternatives_cache = TTLCache(maxsize=256, ttl=settings.ALTERNATIVES_CACHE_TTL)
+        self._itinerary_cache = TTLCache(maxsize=256, ttl=settings.ITINERARY_CACHE_TTL)
     
-    def generate_itinerary(self, travel_data: Dict[str, Any], duration: int, 
+    async def generate_itinerary(self, travel_data: Dict[str, Any], duration: int, 
                           preferences: List[str], travel_type: str) -> str:
         """
         Generate a detailed travel itinerary using LLM with enhanced weather analysis
         """
+        try:
+            chunks = []
+            async for chunk in self.astream_itinerary(travel_data, duration, preferences, travel_type):
+                chunks.append(chunk)
+            return "".join(chunks)
+        except Exception as e:
+            return f"Error generating itinerary: {str(e)}"
+    
+    async def astream_itinerary(self, travel_data: Dict[str, Any], duration: int,
+                                preferences: List[str], travel_type: str) -> AsyncIterator[str]:
+        """
+        Stream the itinerary text chunk by chunk as the LLM produces it
+        """
+        streamed = False
         try:
             # Prepare context from travel data
             weather_info = travel_data.get('weather_analysis', 'Weather information not available')
@@ -24,32 +57,27 @@ class ItineraryChain:
             extended_analysis = weather_data.get('extended_analysis', {})
             daily_forecasts = extended_analysis.get('daily_forecasts', [])
             
+            # Tool results may carry an error payload instead of a list; normalize once here
             hotels = travel_data.get('hotel_options', [])
+            if not isinstance(hotels, list):
+                hotels = []
             attractions = travel_data.get('attraction_options', [])
             flights = travel_data.get('flight_options', [])
+            if not isinstance(flights, list):
+                flights = []
             
             # Format hotels and attractions
-            hotel_list = "\n".join([
-                f"- {hotel.get('name', 'Unknown')}: {hotel.get('description', 'No description')[:100]}..."
-                for hotel in (hotels if isinstance(hotels, list) else [])[:3]
-            ]) if hotels else "No hotel information available"
-            
-            attraction_list = "\n".join([
-                f"- {attr.get('name', 'Unknown')} ({attr.get('category', 'General')}): {attr.get('description', 'No description')[:100]}..."
-                for attr in attractions[:5]
-            ]) if attractions else "No attraction information available"
-            
-            flight_info = "\n".join([
-                f"- {flight.get('airline', 'Unknown')}: ${flight.get('price', 'N/A')} - {flight.get('departure_time', '')} to {flight.get('arrival_time', '')}"
-                for flight in (flights if isinstance(flights, list) else [])[:2]
-            ]) if flights else "No flight information available"
+            hotel_list = "\n".join(map(_format_hotel, hotels[:3])) if hotels else "No hotel information available"
+            attraction_list = "\n".join(map(_format_attraction, attractions[:5])) if attractions else "No attraction information available"
+            flight_info = "\n".join(map(_format_flight, flights[:2])) if flights else "No flight information available"
             
             # Enhanced weather information
             daily_weather_info = ""
             if daily_forecasts:
-                daily_weather_info = "\n\nDAILY WEATHER FORECAST:\n"
-                for day in daily_forecasts:
-                    daily_weather_info += f"- {day['day_name']} ({day['date']}): {day['description']}, {day['temperature']}°C - {day['suitability_level']}\n"
+                daily_weather_info = "\n\nDAILY WEATHER FORECAST:\n" + "".join(
+                    f"- {day['day_name']} ({day['date']}): {day['description']}, {day['temperature']}°C - {day['suitability_level']}\n"
+                    for day in daily_forecasts
+                )
             
             user_prompt = f"""
             Create a {duration}-day travel itinerary with the following details:
@@ -85,6 +113,12 @@ class ItineraryChain:
             If certain days have poor weather, suggest indoor alternatives.
             """
             
+            # The prompt captures every input the LLM sees, so it is the cache key
+            cached = self._itinerary_cache.get(user_prompt)
+            if cached is not None:
+                yield cached
+                return
+            
             try:
                 system_prompt = """You are an expert travel planner. Create detailed, practical itineraries 
                 that consider weather conditions, user preferences, and available attractions.
@@ -95,12 +129,25 @@ class ItineraryChain:
                     HumanMessage(content=user_prompt)
                 ]
                 
-                response = self.llm.invoke(messages)
-                return response.content
+                chunks = []
+                async for chunk in self.llm.astream(messages):
+                    if chunk.content:
+                        streamed = True
+                        chunks.append(chunk.content)
+                        yield chunk.content
+                
+                # Only complete LLM responses are cached, never the fallback text
+                if chunks:
+                    self._itinerary_cache.set(user_prompt, "".join(chunks))
+                return
                 
             except Exception as llm_error:
+                # A stream that broke part way through cannot be patched up
+                if streamed:
+                    raise
+                
                 # Fallback itinerary generation without LLM
-                return self._generate_fallback_itinerary(
+                yield self._generate_fallback_itinerary(
                     travel_data.get('destination', 'Unknown'),
                     duration,
                     preferences,
@@ -112,7 +159,9 @@ class ItineraryChain:
                 )
             
         except Exception as e:
-            return f"Error generating itinerary: {str(e)}"
+            if streamed:
+                raise
+            yield f"Error generating itinerary: {str(e)}"
     
     def _generate_fallback_itinerary(self, destination: str, duration: int, 
                                    preferences: List[str], travel_type: str,
@@ -120,10 +169,12 @@ class ItineraryChain:
                                    hotels: List[Dict], attractions: List[Dict]) -> str:
         """Generate a basic itinerary without LLM as fallback"""
         
-        hotel_names = [hotel.get('name', 'Hotel') for hotel in (hotels if isinstance(hotels, list) else [])[:2]]
+        hotel_names = [hotel.get('name', 'Hotel') for hotel in hotels[:2]]
         attraction_names = [attr.get('name', 'Attraction') for attr in attractions[:5]]
         
-        itinerary = f"""
+        # Sections are collected and joined once; growing one string with +=
+        # would copy everything built so far on every day of the trip
+        parts = [f"""
         {destination.upper()} TRAVEL ITINERARY ({duration} Days)
         ===========================================
         
@@ -135,27 +186,29 @@ class ItineraryChain:
         WEATHER ANALYSIS:
         {weather_info}
         
-        """
+        """]
         
         # Add daily weather if available
         if daily_forecasts:
-            itinerary += "DAILY WEATHER FORECAST:\n"
-            for day in daily_forecasts:
-                itinerary += f"- {day['day_name']}: {day['description']}, {day['temperature']}°C ({day['suitability_level']})\n"
-            itinerary += "\n"
+            parts.append("DAILY WEATHER FORECAST:\n")
+            parts.extend(
+                f"- {day['day_name']}: {day['description']}, {day['temperature']}°C ({day['suitability_level']})\n"
+                for day in daily_forecasts
+            )
+            parts.append("\n")
         
-        itinerary += f"""
+        parts.append(f"""
         RECOMMENDED ACCOMMODATIONS:
         {chr(10).join(f"- {hotel}" for hotel in hotel_names) if hotel_names else "No hotel information available"}
         
-        """
+        """)
         
         # Generate day-by-day itinerary considering weather
         for day in range(1, duration + 1):
             day_weather = daily_forecasts[day-1] if day <= len(daily_forecasts) else None
             weather_desc = day_weather['description'] if day_weather else "Unknown"
             
-            itinerary += f"""
+            parts.append(f"""
         DAY {day}:
         ---------
         Weather: {weather_desc}
@@ -166,9 +219,9 @@ class ItineraryChain:
         
         Recommendations: {', '.join(day_weather.get('recommendations', ['Plan according to weather'])) if day_weather else 'Check weather updates'}
         
-        """
+        """)
         
-        itinerary += """
+        parts.append("""
         GENERAL TRAVEL TIPS:
         - Check weather forecast daily and dress appropriately
         - Keep local emergency numbers handy
@@ -181,16 +234,21 @@ class ItineraryChain:
         - Look for free attractions and activities
         - Eat at local restaurants away from tourist areas
         - Book accommodations in advance for better rates
-        """
+        """)
         
-        return itinerary
+        return "".join(parts)
     
-    def generate_alternative_suggestions(self, destination: str, issue: str, 
+    async def generate_alternative_suggestions(self, destination: str, issue: str, 
                                        preferences: List[str]) -> List[str]:
         """
         Generate alternative travel suggestions when primary plan has issues
         """
         try:
+            cache_key = (destination.lower().strip(), issue, tuple(sorted(preferences)))
+            cached = self._alternatives_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             prompt = f"""
             The travel plan for {destination} has an issue: {issue}
             
@@ -203,32 +261,88 @@ class ItineraryChain:
             4. Indoor alternatives for poor weather days
             
             Provide concise, practical alternatives.
+            Return ONLY a JSON array of 3 strings.
             """
             
             try:
-                response = self.llm.invoke([
+                response = await self.llm.ainvoke([
                     SystemMessage(content="You provide creative travel solutions and alternatives."),
                     HumanMessage(content=prompt)
-                ])
+                ], response_mime_type="application/json")
                 
-                # Parse the response into a list of alternatives
-                alternatives = [
-                    line.strip()[3:] if line.strip().startswith(f"{i+1}.") else line.strip()
-                    for i, line in enumerate(response.content.split('\n'))
-                    if line.strip() and not line.strip().startswith('Alternative')
-                ]
+                # JSON mode returns the alternatives ready to decode, no line parsing needed
+                parsed = orjson.loads(response.content)
+                if not isinstance(parsed, list):
+                    raise ValueError("Expected a JSON array of alternatives")
                 
-                return [alt for alt in alternatives if alt][:3]
+                alternatives = [str(alt).strip() for alt in parsed if str(alt).strip()][:3]
+                self._alternatives_cache.set(cache_key, alternatives)
+                return alternatives
                 
             except Exception as llm_error:
                 # Fallback alternatives
-                return [
-                    f"Consider visiting {destination} during different dates with better weather",
-                    f"Explore indoor activities and museums in {destination}",
-                    f"Look for nearby destinations with better weather conditions"
-                ]
+                return self._fallback_alternatives(destination)
             
         except Exception as e:
             return [f"Could not generate alternatives due to error: {str(e)}"]
 
+    async def generate_alternatives_batch(self, destination: str, issues: List[str],
+                                          preferences: List[str]) -> Dict[str, List[str]]:
+        """
+        Generate alternatives for several plan issues with a single LLM call
+        """
+        results: Dict[str, List[str]] = {}
+        pending = []
+        for issue in dict.fromkeys(issues):
+            cached = self._alternatives_cache.get((destination.lower().strip(), issue, tuple(sorted(preferences))))
+            if cached is not None:
+                results[issue] = cached
+            else:
+                pending.append(issue)
+        
+        if not pending:
+            return results
+        
+        issue_list = "\n".join(f"{i}) {issue}" for i, issue in enumerate(pending, 1))
+        prompt = f"""
+        The travel plan for {destination} has the following issues:
+        {issue_list}
+        
+        User preferences: {', '.join(preferences)}
+        
+        For each issue, suggest 3 concise, practical alternative solutions, such as
+        alternative dates, nearby destinations, modified activities or indoor options.
+        
+        Respond with a JSON object mapping each issue number to a list of 3 strings,
+        for example {{"1": ["...", "...", "..."]}}.
+        """
+        
+        try:
+            response = await self.llm.ainvoke([
+                SystemMessage(content="You provide creative travel solutions and alternatives."),
+                HumanMessage(content=prompt)
+            ], response_mime_type="application/json")
+            parsed = orjson.loads(response.content)
+        except Exception:
+            parsed = {}
+        
+        for i, issue in enumerate(pending, 1):
+            alternatives = parsed.get(str(i)) if isinstance(parsed, dict) else None
+            if isinstance(alternatives, list) and alternatives:
+                alternatives = [str(alt).strip() for alt in alternatives if str(alt).strip()][:3]
+                self._alternatives_cache.set((destination.lower().strip(), issue, tuple(sorted(preferences))), alternatives)
+            else:
+                alternatives = self._fallback_alternatives(destination)
+            results[issue] = alternatives
+        
+        return results
+
+    def _fallback_alternatives(self, destination: str) -> List[str]:
+        """Generic alternatives used when the LLM is unavailable"""
+        return [
+            f"Consider visiting {destination} during different dates with better weather",
+            f"Explore indoor activities and museums in {destination}",
+            f"Look for nearby destinations with better weather conditions"
+        ]
+
 itinerary_chain = ItineraryChain()
\ No newline at end of file
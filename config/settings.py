@@ -1,4 +1,6 @@
 import os
+import importlib.util
+import threading
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -16,6 +18,12 @@ class Settings:
     LLM_MODEL = "gemini-2.0-flash"  # Changed from gemini-pro
     LLM_TEMPERATURE = 0.1
     
+    # LLM Latency Tuning - Gemini has no latency-optimized tier, so bound the
+    # request instead of the client's default 6 exponential-backoff retries
+    LLM_TIMEOUT = 30  # seconds
+    LLM_MAX_RETRIES = 2
+    LLM_STREAMING = True  # Surface tokens as they are generated
+    
     # API Endpoints
     OPENWEATHER_BASE_URL = "http://api.openweathermap.org/data/2.5"
     AVIATIONSTACK_BASE_URL = "http://api.aviationstack.com/v1"
@@ -24,9 +32,44 @@ class Settings:
     MAX_ITERATIONS = 10
     DEFAULT_BUDGET = 1000
     MAX_CONVERSATION_HISTORY = 20
+    MAX_BATCH_CONCURRENCY = 16  # Planning runs in flight at once in plan_trips_batch
+    
+    # HTTP Settings - tool calls run in worker threads, so a request without a
+    # timeout can hold a thread indefinitely
+    HTTP_TIMEOUT = 10  # seconds
+    HTTP_CONNECT_TIMEOUT = 3  # seconds; a host that doesn't accept by then is retried
+    HTTP_RETRIES = 2  # Retries for connection errors and 429/5xx responses
+    HTTP_RETRY_BACKOFF = 0.2  # seconds, doubled after each retry
+    TOOL_THREAD_POOL_SIZE = 32  # Worker threads shared by all in-flight tool calls
+    
+    # DuckDuckGo search - the html backend avoids the api backend's rate-limit
+    # stalls; rate-limited queries are retried with backoff, rotating proxies
+    DDGS_BACKEND = os.getenv("DDGS_BACKEND", "html")
+    DDGS_PROXIES = [proxy.strip() for proxy in os.getenv("DDGS_PROXIES", "").split(",") if proxy.strip()]
+    DDGS_MAX_ATTEMPTS = 3
+    DDGS_RETRY_BACKOFF = 0.4  # seconds, doubled after each failed attempt
+    
+    # Web flight search is skipped for routes where it rarely yields usable flights
+    FLIGHT_SEARCH_MIN_ATTEMPTS = 5
+    FLIGHT_SEARCH_MIN_SUCCESS_RATE = 0.2
+    
+    # Cache Settings (seconds)
+    TRAVEL_DATA_CACHE_TTL = 900
+    ALTERNATIVES_CACHE_TTL = 900
+    ITINERARY_CACHE_TTL = 1800
+    FLIGHT_SEARCH_CACHE_TTL = 600
+    WEATHER_CACHE_TTL = 600
+    SEARCH_RESULTS_CACHE_TTL = 3600  # Raw web search results, shared by all destinations
+    FLIGHT_ROUTE_STATS_TTL = 3600  # A route skipped as unsearchable is retried after this
+    SYSTEM_METRICS_CACHE_TTL = 60
     
     # LangSmith Configuration
     LANGCHAIN_ENDPOINT = "https://api.smith.langchain.com"
+    LANGSMITH_PROBE_TIMEOUT_MS = 1500
+    
+    # None until the background LangSmith probe has finished
+    _langsmith_ok = None
+    _langsmith_probe_started = False
     
     def validate_settings(self):
         missing_keys = []
@@ -40,13 +83,24 @@ class Settings:
         if missing_keys:
             raise ValueError(f"Missing environment variables: {', '.join(missing_keys)}")
         
-        # Test LangSmith connection
-        if self.LANGCHAIN_TRACING_V2 and self.LANGCHAIN_API_KEY:
-            try:
-                import langsmith
-                client = langsmith.Client()
-                print("✅ LangSmith connection successful")
-            except Exception as e:
-                print(f"⚠️ LangSmith connection issue: {e}")
+        # Test LangSmith connection once per process, off the calling thread
+        if self.LANGCHAIN_TRACING_V2 and self.LANGCHAIN_API_KEY and not self._langsmith_probe_started:
+            self._langsmith_probe_started = True
+            threading.Thread(target=self._probe_langsmith, name="langsmith-probe", daemon=True).start()
+    
+    def _probe_langsmith(self):
+        if importlib.util.find_spec("langsmith") is None:
+            self._langsmith_ok = False
+            print("⚠️ LangSmith connection issue: langsmith is not installed")
+            return
+        
+        try:
+            import langsmith
+            langsmith.Client(timeout_ms=self.LANGSMITH_PROBE_TIMEOUT_MS)
+            self._langsmith_ok = True
+            print("✅ LangSmith connection successful")
+        except Exception as e:
+            self._langsmith_ok = False
+            print(f"⚠️ LangSmith connection issue: {e}")
 
 settings = Settings()
\ No newline at end of file
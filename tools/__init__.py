@@ -1,6 +1,6 @@
-from .weather_tool import weather_tool
+from .weather_tool import get_weather_tool
 from .search_tool import search_tool
 from .travel_tools import travel_tools
 from .flight_tools import flight_tools
 
-__all__ = ["weather_tool", "search_tool", "travel_tools", "flight_tools"]
\ No newline at end of file
+__all__ = ["get_weather_tool", "search_tool", "travel_tools", "flight_tools"]
\ No newline at end of file
@@ -1,19 +1,161 @@
-import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from config.settings import settings
+from utils.cache import TTLCache
 import random
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from operator import attrgetter
 import logging
-from duckduckgo_search import DDGS
+import re
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Price patterns like $65, ₹5000, Rs. 3500 or INR 3500; search result text is
+# lowercased before it gets here, hence the case-insensitive INR markers
+_USD_PRICE_PATTERN = re.compile(r'\$(\d{2,4})')
+_INR_PRICE_PATTERN = re.compile(r'(?:₹|rs\.?|inr)\s*(\d{3,5})', re.IGNORECASE)
+
+# IATA codes for the airlines the search knows about
+_AIRLINE_CODES = {
+    "IndiGo": "6E",
+    "Air India": "AI",
+    "SpiceJet": "SG",
+    "Vistara": "UK",
+    "Go First": "G8",
+    "AirAsia India": "I5",
+    "Akasa Air": "QP"
+}
+
+_FULL_SERVICE_AIRLINES = frozenset({"Air India", "Vistara"})
+_LOW_COST_AIRLINES = frozenset({"IndiGo", "SpiceJet", "Go First", "AirAsia India", "Akasa Air"})
+
+# Amenity lists are shared between flights, so they are immutable tuples
+_LOW_COST_AMENITIES = ("In-flight entertainment", "Buy-on-board meals", "Seat selection")
+_FULL_SERVICE_AMENITIES = ("In-flight entertainment", "Complimentary meals", "Extra legroom option", "Priority boarding")
+_DEFAULT_AMENITIES = ("In-flight entertainment", "Refreshments")
+
+# Domestic India flight times as (departure, arrival, duration, duration in minutes)
+_TIME_SLOTS = (
+    ("06:00", "08:15", "2h 15m", 135),
+    ("09:30", "11:45", "2h 15m", 135),
+    ("12:00", "14:20", "2h 20m", 140),
+    ("15:45", "18:00", "2h 15m", 135),
+    ("18:30", "20:45", "2h 15m", 135),
+    ("21:00", "23:15", "2h 15m", 135)
+)
+# Morning and evening slots, preferred by full-service carriers
+_FULL_SERVICE_TIME_SLOTS = tuple(_TIME_SLOTS[i] for i in (0, 1, 4, 5))
+
+# Realistic price ranges for Indian domestic routes (in USD)
+_ROUTE_PRICE_RANGES = {
+    'bangalore-goa': (60, 150),
+    'delhi-goa': (80, 200),
+    'mumbai-goa': (70, 180),
+    'chennai-goa': (75, 190),
+    'kolkata-goa': (90, 220),
+    'default': (65, 170)
+}
+
+# Result titles containing any of these are hotel or aggregator pages
+_NON_FLIGHT_INDICATORS = ('booking.com', 'tripadvisor', 'agoda', 'makemytrip', 'yatra', 'expedia', 'hotel')
+
+# Lowercase airline mentions in priority order, with the airline they name.
+# A handful of `in` checks runs in C and beats one regex alternation over the text
+_AIRLINE_KEYWORDS = (
+    ("indigo", "IndiGo"),
+    ("air india", "Air India"),
+    ("spicejet", "SpiceJet"),
+    ("spice jet", "SpiceJet"),
+    ("vistara", "Vistara"),
+    ("airasia", "AirAsia India"),
+    ("air asia", "AirAsia India"),
+    ("akasa", "Akasa Air"),
+    ("go first", "Go First")
+)
+
+@dataclass(slots=True)
+class Flight:
+    """One flight option while the search builds and ranks it; search_flights
+    returns plain dicts via to_dict, since planning state must stay serializable"""
+    id: str
+    airline: str
+    flight_number: str
+    aircraft: str
+    origin: str
+    destination: str
+    date: str
+    price: int
+    departure_time: str
+    arrival_time: str
+    duration: str
+    duration_minutes: int
+    rating: float
+    reviews: int
+    amenities: Tuple[str, ...]
+    booking_url: str
+    emissions: str
+    source: str
+    layovers: int = 0
+    travel_class: str = "economy"
+    currency: str = "USD"
+    baggage_allowance: str = "15kg check-in + 7kg cabin"
+    cancellation_policy: str = "Standard"
+    type: str = "domestic"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "airline": self.airline,
+            "flight_number": self.flight_number,
+            "aircraft": self.aircraft,
+            "class": self.travel_class,
+            "origin": self.origin,
+            "destination": self.destination,
+            "date": self.date,
+            "price": self.price,
+            "currency": self.currency,
+            "departure_time": self.departure_time,
+            "arrival_time": self.arrival_time,
+            "duration": self.duration,
+            "duration_minutes": self.duration_minutes,
+            "layovers": self.layovers,
+            "baggage_allowance": self.baggage_allowance,
+            "cancellation_policy": self.cancellation_policy,
+            "rating": self.rating,
+            "reviews": self.reviews,
+            "amenities": self.amenities,
+            "booking_url": self.booking_url,
+            "emissions": self.emissions,
+            "type": self.type,
+            "source": self.source
+        }
+
 class FlightTools:
     def __init__(self):
-        self.ddgs = DDGS()
+        # Created on first web search; importing duckduckgo_search is slow
+        self._ddgs = None
+        self._ddgs_lock = threading.Lock()
         # Real Indian airlines
         self.indian_airlines = ["IndiGo", "Air India", "SpiceJet", "Vistara", "AirAsia India", "Akasa Air"]
         self.aircraft = ["A320", "B737", "A321", "A319", "ATR 72"]
+        # One worker per query variant, so a search costs about one round trip
+        self._search_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="flight-search")
+        self._search_cache = TTLCache(maxsize=512, ttl=settings.FLIGHT_SEARCH_CACHE_TTL)
+        # (successes, attempts) of the web search per route; entries expire so
+        # a route that was given up on gets another chance later
+        self._route_stats = TTLCache(maxsize=1024, ttl=settings.FLIGHT_ROUTE_STATS_TTL)
+        self._route_stats_lock = threading.Lock()
+    
+    @property
+    def ddgs(self):
+        if self._ddgs is None:
+            with self._ddgs_lock:
+                if self._ddgs is None:
+                    from duckduckgo_search import DDGS
+                    self._ddgs = DDGS(timeout=settings.HTTP_TIMEOUT)
+        return self._ddgs
     
     def search_flights(self, origin: str, destination: str, date: str, 
                       budget: float = None, passengers: int = 1) -> Dict[str, Any]:
@@ -30,61 +172,96 @@ class FlightTools:
                 # Fallback to enhanced realistic mock data
                 flights = self._generate_realistic_indian_flights(origin, destination, date, budget)
             
-            recommendations = self._get_flight_recommendations(flights, budget)
-            
-            return {
-                "status": "success",
-                "total_flights": len(flights),
-                "price_range": f"${min(f['price'] for f in flights)} - ${max(f['price'] for f in flights)}",
-                "flights": flights,
-                "recommendations": recommendations,
-                "search_parameters": {
-                    "origin": origin,
-                    "destination": destination,
-                    "date": date,
-                    "budget": budget,
-                    "passengers": passengers
-                }
-            }
+            return self._flight_search_result(flights, origin, destination, date, budget, passengers)
             
         except Exception as e:
             logger.error(f"Flight search failed: {str(e)}")
             # Fallback to realistic mock data
             flights = self._generate_realistic_indian_flights(origin, destination, date, budget)
-            return {
-                "status": "success",
-                "total_flights": len(flights),
-                "price_range": f"${min(f['price'] for f in flights)} - ${max(f['price'] for f in flights)}",
-                "flights": flights,
-                "recommendations": self._get_flight_recommendations(flights, budget),
-                "search_parameters": {
-                    "origin": origin,
-                    "destination": destination,
-                    "date": date,
-                    "budget": budget,
-                    "passengers": passengers
-                }
+            return self._flight_search_result(flights, origin, destination, date, budget, passengers)
+    
+    def _flight_search_result(self, flights: List[Flight], origin: str, destination: str, date: str,
+                              budget: Optional[float], passengers: int) -> Dict[str, Any]:
+        """Rank the flights and convert them to plain dicts at the tool boundary"""
+        recommendations = self._get_flight_recommendations(flights, budget)
+        for key in ("best_budget", "best_rated", "quickest"):
+            if key in recommendations:
+                recommendations[key] = recommendations[key].to_dict()
+        
+        return {
+            "status": "success",
+            "total_flights": len(flights),
+            "price_range": f"${min(f.price for f in flights)} - ${max(f.price for f in flights)}",
+            "flights": [flight.to_dict() for flight in flights],
+            "recommendations": recommendations,
+            "search_parameters": {
+                "origin": origin,
+                "destination": destination,
+                "date": date,
+                "budget": budget,
+                "passengers": passengers
             }
+        }
     
-    def _search_real_flights(self, origin: str, destination: str, date: str) -> List[Dict[str, Any]]:
+    def _search_real_flights(self, origin: str, destination: str, date: str) -> List[Flight]:
         """Search for real flight information using web search"""
         try:
-            query = f"flights from {origin} to {destination} {date} price"
-            results = self.ddgs.text(query, max_results=5)
+            cache_key = (origin.lower().strip(), destination.lower().strip(), date)
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Skip the network round trip on routes where parsing keeps failing;
+            # the mock generator will win there anyway
+            route_key = cache_key[:2]
+            successes, attempts = self._route_stats.get(route_key, (0, 0))
+            if (attempts >= settings.FLIGHT_SEARCH_MIN_ATTEMPTS
+                    and successes / attempts < settings.FLIGHT_SEARCH_MIN_SUCCESS_RATE):
+                return []
+            
+            # Query variants run concurrently; a slow one is dropped at the timeout
+            queries = [
+                f"flights from {origin} to {destination} {date} price",
+                f"{origin} to {destination} cheap flights {date}",
+                f"IndiGo Air India SpiceJet {origin} {destination} flight fare {date}"
+            ]
+            futures = [self._search_executor.submit(self.ddgs.text, query, max_results=5) for query in queries]  # BLOCKING
+            wait(futures, timeout=settings.HTTP_TIMEOUT)
             
             flights = []
-            for result in results:
-                flight = self._parse_flight_search_result(result, origin, destination, date)
-                if flight and self._is_valid_flight(flight):
-                    flights.append(flight)
+            seen_urls = set()
+            for future in futures:
+                if not future.done() or future.exception() is not None:
+                    continue
+                for result in future.result() or []:
+                    # The same page often ranks for several of the queries
+                    url = result.get('href')
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    
+                    flight = self._parse_flight_search_result(result, origin, destination, date)
+                    if flight and self._is_valid_flight(flight):
+                        flights.append(flight)
             
-            return flights[:4]  # Return top 4 results
+            flights = flights[:4]  # Return top 4 results
+            self._record_route_search(route_key, len(flights) >= 2)
+            # Empty results are not cached, so the next search can try again
+            if flights:
+                self._search_cache.set(cache_key, flights)
+            return flights
             
         except Exception as e:
             logger.warning(f"Real flight search failed: {e}")
             return []
     
-    def _parse_flight_search_result(self, result: Dict, origin: str, destination: str, date: str) -> Optional[Dict[str, Any]]:
+    def _record_route_search(self, route_key: tuple, succeeded: bool) -> None:
+        """Count a web search attempt for the route; success means search_flights can use it"""
+        with self._route_stats_lock:
+            successes, attempts = self._route_stats.get(route_key, (0, 0))
+            self._route_stats.set(route_key, (successes + succeeded, attempts + 1))
+    
+    def _parse_flight_search_result(self, result: Dict, origin: str, destination: str, date: str) -> Optional[Flight]:
         """Parse flight information from search results"""
         try:
             title = result.get('title', '').lower()
@@ -92,8 +269,7 @@ class FlightTools:
             url = result.get('href', '')
             
             # Skip if it's clearly not a flight result
-            skip_indicators = ['booking.com', 'tripadvisor', 'agoda', 'makemytrip', 'yatra', 'expedia', 'hotel']
-            if any(indicator in title for indicator in skip_indicators):
+            if any(indicator in title for indicator in _NON_FLIGHT_INDICATORS):
                 return None
             
             # Extract airline and price information
@@ -106,31 +282,27 @@ class FlightTools:
             # Generate realistic flight details
             flight_details = self._generate_flight_details(origin, destination, airline, price)
             
-            flight = {
-                "id": f"FL{random.randint(1000, 9999)}",
-                "airline": airline,
-                "flight_number": f"{self._get_airline_code(airline)}{random.randint(100, 999)}",
-                "aircraft": random.choice(self.aircraft),
-                "class": "economy",
-                "origin": origin,
-                "destination": destination,
-                "date": date,
-                "price": price,
-                "currency": "USD",
-                "departure_time": flight_details['departure_time'],
-                "arrival_time": flight_details['arrival_time'],
-                "duration": flight_details['duration'],
-                "layovers": flight_details['layovers'],
-                "baggage_allowance": "15kg check-in + 7kg cabin",
-                "cancellation_policy": "Standard",
-                "rating": round(random.uniform(3.8, 4.6), 1),
-                "reviews": random.randint(50, 500),
-                "amenities": self._get_flight_amenities(airline),
-                "booking_url": url,
-                "emissions": f"{random.randint(80, 200)} kg CO2",
-                "type": "domestic",
-                "source": "web_search"
-            }
+            flight = Flight(
+                id=f"FL{random.randint(1000, 9999)}",
+                airline=airline,
+                flight_number=f"{self._get_airline_code(airline)}{random.randint(100, 999)}",
+                aircraft=random.choice(self.aircraft),
+                origin=origin,
+                destination=destination,
+                date=date,
+                price=price,
+                departure_time=flight_details['departure_time'],
+                arrival_time=flight_details['arrival_time'],
+                duration=flight_details['duration'],
+                duration_minutes=flight_details['duration_minutes'],
+                layovers=flight_details['layovers'],
+                rating=round(random.uniform(3.8, 4.6), 1),
+                reviews=random.randint(50, 500),
+                amenities=self._get_flight_amenities(airline),
+                booking_url=url,
+                emissions=f"{random.randint(80, 200)} kg CO2",
+                source="web_search"
+            )
             
             return flight
             
@@ -142,194 +314,142 @@ class FlightTools:
         """Extract airline name from text"""
         text_lower = text.lower()
         
-        # Check for Indian airlines first
-        for airline in self.indian_airlines:
-            if airline.lower() in text_lower:
+        for keyword, airline in _AIRLINE_KEYWORDS:
+            if keyword in text_lower:
                 return airline
         
-        # Check for common airline indicators
-        if 'indigo' in text_lower:
-            return "IndiGo"
-        elif 'air india' in text_lower:
-            return "Air India"
-        elif 'spicejet' in text_lower or 'spice jet' in text_lower:
-            return "SpiceJet"
-        elif 'vistara' in text_lower:
-            return "Vistara"
-        elif 'airasia' in text_lower or 'air asia' in text_lower:
-            return "AirAsia India"
-        elif 'akasa' in text_lower:
-            return "Akasa Air"
-        elif 'go first' in text_lower:
-            return "Go First"
-        
         # If no specific airline found, return a random Indian airline
         return random.choice(self.indian_airlines)
     
     def _extract_price_from_text(self, text: str) -> int:
         """Extract price from text"""
-        # Look for price patterns like ₹5000 or $65 or Rs. 3500
-        import re
-        
         # Look for USD prices
-        usd_pattern = r'\$(\d{2,4})'
-        usd_match = re.search(usd_pattern, text)
+        usd_match = _USD_PRICE_PATTERN.search(text)
         if usd_match:
             return int(usd_match.group(1))
         
         # Look for INR prices and convert to USD (approx 1 USD = 83 INR)
-        inr_patterns = [r'₹\s*(\d{3,5})', r'Rs\.?\s*(\d{3,5})', r'INR\s*(\d{3,5})']
-        for pattern in inr_patterns:
-            inr_match = re.search(pattern, text)
-            if inr_match:
-                inr_price = int(inr_match.group(1))
-                usd_price = max(30, inr_price // 83)  # Convert to USD, minimum $30
-                return usd_price
+        inr_match = _INR_PRICE_PATTERN.search(text)
+        if inr_match:
+            inr_price = int(inr_match.group(1))
+            return max(30, inr_price // 83)  # Convert to USD, minimum $30
         
         # If no price found, generate realistic price based on route
         return random.randint(50, 200)
     
-    def _generate_flight_details(self, origin: str, destination: str, airline: str, price: int) -> Dict[str, Any]:
-        """Generate realistic flight details"""
-        # Domestic India flight times
-        time_slots = [
-            ("06:00", "08:15", "2h 15m"),
-            ("09:30", "11:45", "2h 15m"),
-            ("12:00", "14:20", "2h 20m"),
-            ("15:45", "18:00", "2h 15m"),
-            ("18:30", "20:45", "2h 15m"),
-            ("21:00", "23:15", "2h 15m")
-        ]
-        
-        departure, arrival, duration = random.choice(time_slots)
-        
+    def _generate_flight_details(self, origin: str, destination: str, airline: str, price: int,
+                                 time_slot: Optional[Tuple[str, str, str, int]] = None) -> Dict[str, Any]:
+        """Generate realistic flight details; time_slot is a pre-drawn entry of _TIME_SLOTS"""
         # Adjust based on airline (full-service carriers might have better timings)
-        if airline in ["Air India", "Vistara"]:
-            # Prefer morning and evening slots for full-service carriers
-            preferred_slots = [0, 1, 4, 5]
-            departure, arrival, duration = time_slots[random.choice(preferred_slots)]
+        if airline in _FULL_SERVICE_AIRLINES:
+            time_slot = random.choice(_FULL_SERVICE_TIME_SLOTS)
+        elif time_slot is None:
+            time_slot = random.choice(_TIME_SLOTS)
+        departure, arrival, duration, duration_minutes = time_slot
         
         return {
             'departure_time': departure,
             'arrival_time': arrival,
             'duration': duration,
+            'duration_minutes': duration_minutes,
             'layovers': 0  # Most domestic Indian flights are direct
         }
     
-    def _generate_realistic_indian_flights(self, origin: str, destination: str, date: str, budget: float) -> List[Dict[str, Any]]:
+    def _generate_realistic_indian_flights(self, origin: str, destination: str, date: str, budget: float) -> List[Flight]:
         """Generate realistic domestic Indian flights as fallback"""
         flights = []
         
-        # Realistic price ranges for Indian domestic routes (in USD)
-        base_prices = {
-            'bangalore-goa': (60, 150),
-            'delhi-goa': (80, 200),
-            'mumbai-goa': (70, 180),
-            'chennai-goa': (75, 190),
-            'kolkata-goa': (90, 220),
-            'default': (65, 170)
-        }
-        
         route_key = f"{origin.lower().split()[0]}-{destination.lower()}"
-        price_range = base_prices.get(route_key, base_prices['default'])
+        price_range = _ROUTE_PRICE_RANGES.get(route_key, _ROUTE_PRICE_RANGES['default'])
         
-        # Generate 4-5 flight options
-        for i in range(4):
-            airline = random.choice(self.indian_airlines)
-            
+        # Generate 4-5 flight options, drawing each random field for all of them at once
+        num_flights = 4
+        airlines = random.choices(self.indian_airlines, k=num_flights)
+        aircraft = random.choices(self.aircraft, k=num_flights)
+        time_slots = random.choices(_TIME_SLOTS, k=num_flights)
+        ids = random.choices(range(1000, 10000), k=num_flights)
+        numbers = random.choices(range(100, 1000), k=num_flights)
+        reviews = random.choices(range(50, 501), k=num_flights)
+        emissions = random.choices(range(80, 151), k=num_flights)
+        
+        for i, airline in enumerate(airlines):
             # Base price with variations
             base_price = random.randint(price_range[0], price_range[1])
             
             # Adjust price based on airline (full-service vs low-cost)
-            if airline in ["Air India", "Vistara"]:
+            if airline in _FULL_SERVICE_AIRLINES:
                 base_price += random.randint(10, 30)  # Full-service premium
             
             # Adjust for budget constraints
             if budget and base_price > budget * 0.7:
                 base_price = max(price_range[0], int(budget * 0.6))
             
-            flight_details = self._generate_flight_details(origin, destination, airline, base_price)
+            flight_details = self._generate_flight_details(origin, destination, airline, base_price, time_slots[i])
             
-            flight = {
-                "id": f"IN{random.randint(1000, 9999)}",
-                "airline": airline,
-                "flight_number": f"{self._get_airline_code(airline)}{random.randint(100, 999)}",
-                "aircraft": random.choice(self.aircraft),
-                "class": "economy",
-                "origin": origin,
-                "destination": destination,
-                "date": date,
-                "price": base_price,
-                "currency": "USD",
-                "departure_time": flight_details['departure_time'],
-                "arrival_time": flight_details['arrival_time'],
-                "duration": flight_details['duration'],
-                "layovers": 0,
-                "baggage_allowance": "15kg check-in + 7kg cabin",
-                "cancellation_policy": "Standard",
-                "rating": round(random.uniform(3.8, 4.6), 1),
-                "reviews": random.randint(50, 500),
-                "amenities": self._get_flight_amenities(airline),
-                "booking_url": f"https://{airline.lower().replace(' ', '')}.com/book",
-                "emissions": f"{random.randint(80, 150)} kg CO2",
-                "type": "domestic",
-                "source": "enhanced_mock"
-            }
+            flight = Flight(
+                id=f"IN{ids[i]}",
+                airline=airline,
+                flight_number=f"{self._get_airline_code(airline)}{numbers[i]}",
+                aircraft=aircraft[i],
+                origin=origin,
+                destination=destination,
+                date=date,
+                price=base_price,
+                departure_time=flight_details['departure_time'],
+                arrival_time=flight_details['arrival_time'],
+                duration=flight_details['duration'],
+                duration_minutes=flight_details['duration_minutes'],
+                rating=round(random.uniform(3.8, 4.6), 1),
+                reviews=reviews[i],
+                amenities=self._get_flight_amenities(airline),
+                booking_url=f"https://{airline.lower().replace(' ', '')}.com/book",
+                emissions=f"{emissions[i]} kg CO2",
+                source="enhanced_mock"
+            )
             
             flights.append(flight)
         
         # Sort by price
-        flights.sort(key=lambda x: x["price"])
+        flights.sort(key=attrgetter("price"))
         return flights
     
     def _get_airline_code(self, airline: str) -> str:
         """Get IATA code for airline"""
-        codes = {
-            "IndiGo": "6E",
-            "Air India": "AI",
-            "SpiceJet": "SG",
-            "Vistara": "UK",
-            "Go First": "G8",
-            "AirAsia India": "I5",
-            "Akasa Air": "QP"
-        }
-        return codes.get(airline, "IN")
+        return _AIRLINE_CODES.get(airline, "IN")
     
-    def _get_flight_amenities(self, airline: str) -> List[str]:
+    def _get_flight_amenities(self, airline: str) -> Tuple[str, ...]:
         """Get realistic flight amenities"""
-        base_amenities = ["In-flight entertainment"]
-        
-        if airline in ["IndiGo", "SpiceJet", "Go First", "AirAsia India", "Akasa Air"]:
-            return base_amenities + ["Buy-on-board meals", "Seat selection"]
-        elif airline in ["Air India", "Vistara"]:
-            return base_amenities + ["Complimentary meals", "Extra legroom option", "Priority boarding"]
+        if airline in _LOW_COST_AIRLINES:
+            return _LOW_COST_AMENITIES
+        elif airline in _FULL_SERVICE_AIRLINES:
+            return _FULL_SERVICE_AMENITIES
         else:
-            return base_amenities + ["Refreshments"]
+            return _DEFAULT_AMENITIES
     
-    def _is_valid_flight(self, flight: Dict) -> bool:
+    def _is_valid_flight(self, flight: Flight) -> bool:
         """Validate if flight data is realistic"""
-        if not flight.get('airline') or not flight.get('price'):
+        if not flight.airline or not flight.price:
             return False
         
-        if flight['price'] < 20 or flight['price'] > 1000:
+        if flight.price < 20 or flight.price > 1000:
             return False
             
-        if not flight.get('departure_time') or not flight.get('arrival_time'):
+        if not flight.departure_time or not flight.arrival_time:
             return False
             
         return True
     
-    def _get_flight_recommendations(self, flights: List[Dict], budget: float = None) -> Dict[str, Any]:
+    def _get_flight_recommendations(self, flights: List[Flight], budget: float = None) -> Dict[str, Any]:
         """Generate flight recommendations"""
         if not flights:
             return {"best_options": [], "analysis": "No flights available"}
         
         # Find best options
-        cheapest = min(flights, key=lambda x: x["price"])
-        best_rated = max(flights, key=lambda x: x["rating"])
+        cheapest = min(flights, key=attrgetter("price"))
+        best_rated = max(flights, key=attrgetter("rating"))
         
-        # Find quickest flight (shortest duration)
-        quickest = min(flights, key=lambda x: self._parse_duration(x["duration"]))
+        # Find quickest flight (shortest duration), using the minutes stored at construction
+        quickest = min(flights, key=attrgetter("duration_minutes"))
         
         return {
             "best_budget": cheapest,
@@ -338,31 +458,30 @@ class FlightTools:
             "analysis": self._analyze_flight_options(flights, budget)
         }
     
-    def _parse_duration(self, duration_str: str) -> int:
-        """Parse duration string to minutes"""
-        try:
-            parts = duration_str.split()
-            hours = int(parts[0].replace('h', ''))
-            minutes = int(parts[1].replace('m', '')) if len(parts) > 1 else 0
-            return hours * 60 + minutes
-        except:
-            return 150  # Default 2.5 hours
-    
-    def _analyze_flight_options(self, flights: List[Dict], budget: float = None) -> str:
+    def _analyze_flight_options(self, flights: List[Flight], budget: float = None) -> str:
         """Analyze flight options"""
         if not flights:
             return "No flight options available."
         
-        avg_price = sum(f["price"] for f in flights) / len(flights)
-        analysis = f"Found {len(flights)} flights from {flights[0].get('origin', 'Unknown')} to {flights[0].get('destination', 'Unknown')}. "
+        # Gather the price total, affordable count and airlines in one pass
+        total_price = 0
+        affordable = 0
+        airlines = set()
+        for f in flights:
+            price = f.price
+            total_price += price
+            if budget and price <= budget:
+                affordable += 1
+            airlines.add(f.airline)
+        
+        avg_price = total_price / len(flights)
+        analysis = f"Found {len(flights)} flights from {flights[0].origin or 'Unknown'} to {flights[0].destination or 'Unknown'}. "
         analysis += f"Average price: ${avg_price:.0f}. "
         
         if budget:
-            affordable = [f for f in flights if f["price"] <= budget]
-            analysis += f"{len(affordable)} flights within your ${budget} budget. "
+            analysis += f"{affordable} flights within your ${budget} budget. "
         
         # Add airline diversity
-        airlines = set(f["airline"] for f in flights)
         if len(airlines) > 1:
             analysis += f"Multiple airlines available: {', '.join(airlines)}."
         
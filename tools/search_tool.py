@@ -1,23 +1,258 @@
-from duckduckgo_search import DDGS
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import re
 import random
-import requests
-from bs4 import BeautifulSoup
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import settings
+from utils.cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Result titles containing any of these are booking sites or listings, not venues
+_NON_HOTEL_INDICATORS = ('booking.com', 'tripadvisor', 'agoda', 'make my trip', 'yatra', 'expedia')
+_NON_ATTRACTION_INDICATORS = ('tripadvisor', 'booking.com', 'search results', 'wikipedia')
+
+# Site names and filler words stripped from hotel result titles. They are
+# literals, so they are escaped ('...' and '|' must not act as regex syntax)
+# and longer phrases are tried first
+_HOTEL_NAME_REMOVALS = (
+    'booking.com', 'agoda', 'tripadvisor', 'hotels.com', 'makemytrip',
+    'expedia', 'yatra.com', ' - book now', '|', '...', 'hotels in',
+    'best', 'cheap', 'luxury', 'budget', 'hotel', 'resort', 'stay',
+    'accommodation', 'price', 'deals', 'reviews', 'photos'
+)
+
+def _normalize_title(title: str) -> str:
+    """Fold compatibility characters (non-breaking spaces, fullwidth letters, ligatures) to plain text"""
+    return unicodedata.normalize('NFKC', title)
+
+def _literal_alternation(words) -> str:
+    return '|'.join(map(re.escape, sorted(words, key=len, reverse=True)))
+
+# One scan of a hotel title both rejects listing sites and finds the filler to
+# strip; skip indicators come first so they win where the two overlap. Titles
+# are normalized to lowercase first, so the pattern needs no IGNORECASE
+_HOTEL_TITLE_PATTERN = re.compile(
+    f"(?P<skip>{_literal_alternation(_NON_HOTEL_INDICATORS)})|{_literal_alternation(_HOTEL_NAME_REMOVALS)}"
+)
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+# Keyword tuples below are ordered most likely match first, so any() stops
+# early on a hit; order within a tuple never changes the result, but the
+# order of the attraction categories does
+
+# Hotel name fragments that suggest its price category
+_LUXURY_INDICATORS = ('taj', 'marriott', 'resort', 'oberoi', 'itc', 'radisson', 'leela', 'hyatt', 'palace')
+_BUDGET_INDICATORS = ('inn', 'hostel', 'guesthouse', 'lodging', 'budget')
+
+# Attraction categories in priority order with the description keywords that select them
+_ATTRACTION_CATEGORY_KEYWORDS = (
+    ("Beach", ('beach', 'coast', 'shore')),
+    ("Cultural", ('art', 'museum', 'gallery')),
+    ("Nature", ('park', 'garden', 'falls', 'nature', 'waterfall')),
+    ("Shopping", ('market', 'shopping', 'mall')),
+    ("Religious", ('temple', 'church', 'religious', 'mosque')),
+    ("Historical", ('fort', 'palace', 'heritage', 'historical')),
+    ("Food", ('food', 'restaurant', 'cuisine'))
+)
+
+# Realistic hotel price ranges for Indian destinations (in USD)
+_PRICE_RANGES = {
+    'goa': {
+        'budget': (25, 60),
+        'mid-range': (60, 120),
+        'luxury': (120, 300)
+    },
+    'bangalore': {
+        'budget': (20, 50),
+        'mid-range': (50, 100),
+        'luxury': (100, 250)
+    },
+    'delhi': {
+        'budget': (15, 45),
+        'mid-range': (45, 90),
+        'luxury': (90, 200)
+    },
+    'mumbai': {
+        'budget': (25, 65),
+        'mid-range': (65, 130),
+        'luxury': (130, 350)
+    },
+    'default': {
+        'budget': (20, 55),
+        'mid-range': (55, 110),
+        'luxury': (110, 280)
+    }
+}
+
+# Known hotels per destination as (name, price category)
+_DESTINATION_HOTELS = {
+    'goa': (
+        ("Taj Fort Aguada Resort", "luxury"),
+        ("The Leela Goa", "luxury"),
+        ("Alila Diwa Goa", "luxury"),
+        ("Novotel Goa Resort", "mid-range"),
+        ("Goa Marriott Resort", "mid-range"),
+        ("Coconut Grove Beach Resort", "mid-range"),
+        ("Sea Princess Beach Hotel", "budget"),
+        ("Casa Britona", "budget")
+    ),
+    'bangalore': (
+        ("ITC Gardenia", "luxury"),
+        ("The Oberoi Bengaluru", "luxury"),
+        ("Taj West End", "luxury"),
+        ("Radisson Blu Bengaluru", "mid-range"),
+        ("Lemon Tree Premier", "mid-range"),
+        ("Ibis Bengaluru", "mid-range"),
+        ("Hotel Royal Orchid", "budget"),
+        ("Treebo Trend Stay", "budget")
+    ),
+    'default': (
+        ("Grand Plaza Hotel", "luxury"),
+        ("Royal Heritage Stay", "mid-range"),
+        ("City Center Inn", "mid-range"),
+        ("Comfort Suites", "budget")
+    )
+}
+
+# Known attractions per destination as (name, category, description)
+_DESTINATION_ATTRACTIONS = {
+    'goa': (
+        ("Calangute Beach", "Beach", "Queen of beaches in Goa, famous for water sports and beach shacks"),
+        ("Basilica of Bom Jesus", "Historical", "UNESCO World Heritage site with Baroque architecture and St. Francis Xavier's tomb"),
+        ("Dudhsagar Falls", "Nature", "Majestic four-tiered waterfall on Mandovi River in the jungle"),
+        ("Fort Aguada", "Historical", "17th-century Portuguese fort with lighthouse overlooking Arabian Sea"),
+        ("Anjuna Flea Market", "Shopping", "Famous Wednesday flea market with clothes, jewelry and handicrafts"),
+        ("Palolem Beach", "Beach", "Scenic crescent-shaped beach in South Goa with silent parties")
+    ),
+    'bangalore': (
+        ("Lalbagh Botanical Garden", "Nature", "Famous botanical garden with glass house and rare plant species"),
+        ("Bangalore Palace", "Historical", "Royal palace inspired by England's Windsor Castle"),
+        ("Cubbon Park", "Nature", "Historic park in city center perfect for walking and relaxation"),
+        ("ISKCON Temple", "Cultural", "Beautiful Hindu temple dedicated to Lord Krishna"),
+        ("Vidhana Soudha", "Architecture", "Magnificent building housing Karnataka's legislative assembly"),
+        ("Commercial Street", "Shopping", "Popular shopping destination for clothes and accessories")
+    )
+}
+
+# URL slug of each known attraction, so building the fallback list doesn't reformat names
+_ATTRACTION_URL_SLUGS = {
+    name: name.replace(' ', '-').lower()
+    for attractions in _DESTINATION_ATTRACTIONS.values()
+    for name, _, _ in attractions
+}
+
+_SUSTAINABILITY_LABELS = ("Eco-friendly", "Green certified", "Standard")
+_ATTRACTION_PRICE_RANGES = ("Free", "$", "$$")
+
+# Hotel descriptions per price category; {destination} is filled in by _hotel_description
+_HOTEL_DESCRIPTIONS = {
+    'budget': "Comfortable and affordable accommodation in {destination}. Perfect for budget-conscious travelers looking for clean, basic amenities and convenient location.",
+    'mid-range': "Excellent mid-range hotel in {destination} offering great value. Features modern amenities, comfortable rooms, and quality service for both business and leisure travelers.",
+    'luxury': "Luxurious 5-star experience in {destination}. Offers premium amenities, exquisite dining, and exceptional service in a prime location. Perfect for discerning travelers."
+}
+_DEFAULT_HOTEL_DESCRIPTION = "Quality accommodation in {destination} with excellent service and amenities."
+
+_BASE_AMENITIES = ("Free WiFi", "Air Conditioning")
+_CATEGORY_AMENITIES = {
+    'budget': _BASE_AMENITIES + ("TV", "24/7 Front Desk", "Housekeeping"),
+    'mid-range': _BASE_AMENITIES + ("Swimming Pool", "Restaurant", "Room Service", "Fitness Center", "Parking")
+}
+_LUXURY_AMENITIES = _BASE_AMENITIES + ("Spa", "Fine Dining", "Concierge", "Business Center",
+                                       "Luxury Toiletries", "Poolside Bar", "Airport Transfer", "Butler Service")
+
+@lru_cache(maxsize=256)
+def _hotel_description(destination: str, category: str) -> str:
+    return _HOTEL_DESCRIPTIONS.get(category, _DEFAULT_HOTEL_DESCRIPTION).format(destination=destination)
+
+@lru_cache(maxsize=256)
+def _category_amenities(category: str) -> tuple:
+    # Anything that isn't budget or mid-range is treated as luxury
+    return _CATEGORY_AMENITIES.get(category, _LUXURY_AMENITIES)
+
+@lru_cache(maxsize=1024)
+def _name_price_category(name_lower: str) -> Optional[str]:
+    """Price category a hotel name implies on its own, or None if it doesn't suggest one"""
+    if any(indicator in name_lower for indicator in _LUXURY_INDICATORS):
+        return 'luxury'
+    if any(indicator in name_lower for indicator in _BUDGET_INDICATORS):
+        return 'budget'
+    return None
+
+# Attraction titles are cut at the first of these markers
+_ATTRACTION_NAME_CUT_PATTERN = re.compile('|'.join(map(re.escape, (
+    '- tripadvisor', '- wikipedia', '|', '...', 'things to do in', 'attractions in'
+))))
+
 class SearchTool:
-    def __init__(self):
-        self.ddgs = DDGS()
+    def __init__(self, proxy: Optional[str] = None):
+        self._proxies = [proxy] if proxy else settings.DDGS_PROXIES
+        # Created on first search; importing duckduckgo_search is slow
+        self._ddgs_pool = None
+        self._ddgs_lock = threading.Lock()
+        # Raw results per (query, max_results); parsing still runs per call so
+        # the per-request pricing and ratings don't repeat
+        self._results_cache = TTLCache(maxsize=512, ttl=settings.SEARCH_RESULTS_CACHE_TTL)
+        # Hotel search query variants run side by side, one worker each
+        self._search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hotel-search")
+    
+    def _get_ddgs_pool(self) -> list:
+        """One DDGS client per proxy; retries move on to the next one"""
+        if self._ddgs_pool is None:
+            with self._ddgs_lock:
+                if self._ddgs_pool is None:
+                    from duckduckgo_search import DDGS
+                    # Each DDGS holds one pooled HTTP client for its lifetime, so keeping
+                    # these on the module singleton reuses warm connections across requests
+                    self._ddgs_pool = [
+                        DDGS(proxy=p, timeout=settings.HTTP_TIMEOUT) for p in self._proxies
+                    ] or [DDGS(timeout=settings.HTTP_TIMEOUT)]
+        return self._ddgs_pool
+    
+    @property
+    def ddgs(self):
+        return self._get_ddgs_pool()[0]
     
-    def search_hotels(self, destination: str, budget: float = None) -> List[Dict[str, Any]]:
+    def _text_search(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Run a DDGS text search, retrying failed attempts with exponential backoff"""
+        cache_key = (query.lower(), max_results)
+        cached = self._results_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        from duckduckgo_search.exceptions import DuckDuckGoSearchException
+        
+        ddgs_pool = self._get_ddgs_pool()
+        for attempt in range(settings.DDGS_MAX_ATTEMPTS):
+            ddgs = ddgs_pool[attempt % len(ddgs_pool)]
+            try:
+                results = ddgs.text(query, max_results=max_results, backend=settings.DDGS_BACKEND)  # BLOCKING
+                # Empty results are not cached, so the next search can try again
+                if results:
+                    self._results_cache.set(cache_key, results)
+                return results
+            except DuckDuckGoSearchException as e:
+                if attempt == settings.DDGS_MAX_ATTEMPTS - 1:
+                    raise
+                logger.info(f"Search attempt {attempt + 1} failed for '{query}': {e}")
+                time.sleep(settings.DDGS_RETRY_BACKOFF * 2 ** attempt)  # BLOCKING
+    
+    def search_hotels(self, destination: str, budget: float = None, seed: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search for real hotels using web scraping with enhanced data
+        
+        The generated ratings, prices and the like come from one random.Random per
+        call; pass seed to make them reproducible
         """
+        rng = random.Random(seed)
         try:
             hotels = []
+            seen_names = set()
+            max_hotels = 6
             
             # Try multiple search strategies
             search_queries = [
@@ -26,16 +261,29 @@ class SearchTool:
                 f"best places to stay in {destination}"
             ]
             
-            for query in search_queries[:2]:
+            queries = search_queries[:2]
+            futures = [self._search_executor.submit(self._text_search, query, 8) for query in queries]  # BLOCKING
+            deadline = time.monotonic() + settings.HTTP_TIMEOUT
+            
+            # Merge in query order so the first query's hotels still rank first;
+            # once they fill the result there's no need to wait for later queries
+            for query, future in zip(queries, futures):
+                if len(hotels) >= max_hotels:
+                    future.cancel()
+                    continue
                 try:
-                    results = self.ddgs.text(query, max_results=8)
+                    results = future.result(timeout=max(0, deadline - time.monotonic()))  # BLOCKING
                     
                     for result in results:
-                        hotel = self._parse_hotel_search_result(result, destination, budget)
+                        hotel = self._parse_hotel_search_result(result, destination, budget, rng)
                         if hotel and self._is_valid_hotel(hotel):
                             # Check for duplicates
-                            if not any(h['name'] == hotel['name'] for h in hotels):
+                            name_key = hotel['name'].lower()
+                            if name_key not in seen_names:
+                                seen_names.add(name_key)
                                 hotels.append(hotel)
+                                if len(hotels) >= max_hotels:
+                                    break
                                 
                 except Exception as e:
                     logger.warning(f"Hotel search query failed: {query}, {e}")
@@ -43,33 +291,29 @@ class SearchTool:
             
             # If we have good results, return them
             if len(hotels) >= 3:
-                return hotels[:6]
+                return hotels
             
             # Fallback to enhanced mock data that's destination-specific
-            return self._generate_destination_specific_hotels(destination, budget)
+            return self._generate_destination_specific_hotels(destination, budget, rng)
             
         except Exception as e:
             logger.error(f"Hotel search failed: {str(e)}")
-            return self._generate_destination_specific_hotels(destination, budget)
+            return self._generate_destination_specific_hotels(destination, budget, rng)
     
-    def _parse_hotel_search_result(self, result: Dict, destination: str, budget: float) -> Dict[str, Any]:
+    def _parse_hotel_search_result(self, result: Dict, destination: str, budget: float,
+                                   rng: random.Random) -> Dict[str, Any]:
         """Parse real hotel data from search results"""
         try:
-            title = result.get('title', '').lower()
-            description = result.get('body', '').lower()
-            
-            # Skip if it's clearly not a hotel (booking sites, generic results)
-            skip_indicators = ['booking.com', 'tripadvisor', 'agoda', 'make my trip', 'yatra', 'expedia']
-            if any(indicator in title for indicator in skip_indicators):
-                return None
+            description = result.get('body', '')
             
-            # Extract hotel name
-            name = self._extract_real_hotel_name(result.get('title', ''), description)
+            # Extract hotel name; None also covers booking sites and generic results
+            title = _normalize_title(result.get('title', '')).lower()
+            name = self._extract_real_hotel_name(title, description)
             if not name or len(name) < 3:
                 return None
             
             # Generate realistic pricing for the destination
-            price_info = self._get_realistic_pricing(destination, budget, name)
+            price_info = self._get_realistic_pricing(destination, budget, name, rng)
             
             # Generate realistic amenities
             amenities = self._generate_realistic_amenities(price_info['category'])
@@ -79,14 +323,14 @@ class SearchTool:
                 "description": self._generate_hotel_description(name, destination, price_info['category']),
                 "price_per_night": price_info['price'],
                 "price_range": price_info['category'],
-                "rating": round(random.uniform(3.8, 4.7), 1),
-                "reviews": random.randint(50, 2000),
+                "rating": round(rng.uniform(3.8, 4.7), 1),
+                "reviews": rng.randint(50, 2000),
                 "amenities": amenities,
                 "location": destination,
                 "url": result.get('href', ''),
                 "type": "Hotel",
-                "sustainability": random.choice(["Eco-friendly", "Green certified", "Standard"]),
-                "distance_center": f"{random.randint(1, 12)} km",
+                "sustainability": rng.choice(_SUSTAINABILITY_LABELS),
+                "distance_center": f"{rng.randint(1, 12)} km",
                 "source": "web_search"
             }
             
@@ -97,79 +341,42 @@ class SearchTool:
             return None
     
     def _extract_real_hotel_name(self, title: str, description: str) -> str:
-        """Extract clean hotel name from search results"""
-        # Remove common website names and prefixes
-        removals = [
-            'booking.com', 'agoda', 'tripadvisor', 'hotels.com', 'makemytrip',
-            'expedia', 'yatra.com', ' - book now', '|', '...', 'hotels in',
-            'best', 'cheap', 'luxury', 'budget', 'hotel', 'resort', 'stay',
-            'accommodation', 'price', 'deals', 'reviews', 'photos'
-        ]
-        
-        name = title
-        for removal in removals:
-            name = re.sub(removal, '', name, flags=re.IGNORECASE)
-        
-        # Clean up the name
-        name = re.sub(r'[^\w\s]', ' ', name)  # Remove special characters
-        name = re.sub(r'\s+', ' ', name).strip()  # Remove extra spaces
+        """Extract clean hotel name from a normalized, lowercased title, or None if it isn't a hotel"""
+        # Remove common website names and prefixes, rejecting booking sites in the same pass
+        pieces = []
+        last_end = 0
+        for match in _HOTEL_TITLE_PATTERN.finditer(title):
+            if match.lastgroup == 'skip':
+                return None
+            pieces.append(title[last_end:match.start()])
+            last_end = match.end()
+        pieces.append(title[last_end:])
         
-        # Title case the name
-        name = name.title()
+        # Remove special characters and extra spaces, then title case the name
+        name = ' '.join(_NON_WORD_PATTERN.sub(' ', ''.join(pieces)).split()).title()
         
         return name if len(name) > 2 else None
     
-    def _get_realistic_pricing(self, destination: str, budget: float, hotel_name: str) -> Dict[str, Any]:
+    def _get_realistic_pricing(self, destination: str, budget: float, hotel_name: str,
+                               rng: random.Random) -> Dict[str, Any]:
         """Get realistic pricing based on destination and hotel type"""
-        # Realistic price ranges for Indian destinations (in USD)
-        price_ranges = {
-            'goa': {
-                'budget': (25, 60),
-                'mid-range': (60, 120),
-                'luxury': (120, 300)
-            },
-            'bangalore': {
-                'budget': (20, 50),
-                'mid-range': (50, 100),
-                'luxury': (100, 250)
-            },
-            'delhi': {
-                'budget': (15, 45),
-                'mid-range': (45, 90),
-                'luxury': (90, 200)
-            },
-            'mumbai': {
-                'budget': (25, 65),
-                'mid-range': (65, 130),
-                'luxury': (130, 350)
-            },
-            'default': {
-                'budget': (20, 55),
-                'mid-range': (55, 110),
-                'luxury': (110, 280)
-            }
-        }
-        
         dest_key = destination.lower()
-        prices = price_ranges.get(dest_key, price_ranges['default'])
+        prices = _PRICE_RANGES.get(dest_key, _PRICE_RANGES['default'])
         
         # Determine category based on hotel name and budget
-        luxury_indicators = ['taj', 'oberoi', 'itc', 'leela', 'hyatt', 'marriott', 'radisson', 'resort', 'palace']
-        budget_indicators = ['lodging', 'inn', 'guesthouse', 'hostel', 'budget']
-        
-        name_lower = hotel_name.lower()
+        name_category = _name_price_category(hotel_name.lower())
         
-        if any(indicator in name_lower for indicator in luxury_indicators) or (budget and budget > 150):
+        if name_category == 'luxury' or (budget and budget > 150):
             category = 'luxury'
             price_range = prices['luxury']
-        elif any(indicator in name_lower for indicator in budget_indicators) or (budget and budget < 50):
+        elif name_category == 'budget' or (budget and budget < 50):
             category = 'budget'
             price_range = prices['budget']
         else:
             category = 'mid-range'
             price_range = prices['mid-range']
         
-        price = random.randint(price_range[0], price_range[1])
+        price = rng.randint(price_range[0], price_range[1])
         
         return {
             'price': price,
@@ -178,25 +385,12 @@ class SearchTool:
     
     def _generate_realistic_amenities(self, category: str) -> List[str]:
         """Generate realistic amenities based on hotel category"""
-        base_amenities = ["Free WiFi", "Air Conditioning"]
-        
-        if category == 'budget':
-            return base_amenities + ["TV", "24/7 Front Desk", "Housekeeping"]
-        elif category == 'mid-range':
-            return base_amenities + ["Swimming Pool", "Restaurant", "Room Service", "Fitness Center", "Parking"]
-        else:  # luxury
-            return base_amenities + ["Spa", "Fine Dining", "Concierge", "Business Center", 
-                                   "Luxury Toiletries", "Poolside Bar", "Airport Transfer", "Butler Service"]
+        # Copied so callers can't mutate the cached tuple's contents through the hotel dict
+        return list(_category_amenities(category))
     
     def _generate_hotel_description(self, name: str, destination: str, category: str) -> str:
         """Generate realistic hotel description"""
-        descriptions = {
-            'budget': f"Comfortable and affordable accommodation in {destination}. Perfect for budget-conscious travelers looking for clean, basic amenities and convenient location.",
-            'mid-range': f"Excellent {category} hotel in {destination} offering great value. Features modern amenities, comfortable rooms, and quality service for both business and leisure travelers.",
-            'luxury': f"Luxurious 5-star experience in {destination}. Offers premium amenities, exquisite dining, and exceptional service in a prime location. Perfect for discerning travelers."
-        }
-        
-        return descriptions.get(category, f"Quality accommodation in {destination} with excellent service and amenities.")
+        return _hotel_description(destination, category)
     
     def _is_valid_hotel(self, hotel: Dict) -> bool:
         """Validate if hotel data is realistic"""
@@ -211,99 +405,88 @@ class SearchTool:
             
         return True
     
-    def _generate_destination_specific_hotels(self, destination: str, budget: float) -> List[Dict[str, Any]]:
+    def _generate_destination_specific_hotels(self, destination: str, budget: float,
+                                              rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
         """Generate destination-specific realistic hotel data"""
-        destination_hotels = {
-            'goa': [
-                {"base_name": "Taj Fort Aguada Resort", "type": "luxury"},
-                {"base_name": "The Leela Goa", "type": "luxury"},
-                {"base_name": "Alila Diwa Goa", "type": "luxury"},
-                {"base_name": "Novotel Goa Resort", "type": "mid-range"},
-                {"base_name": "Goa Marriott Resort", "type": "mid-range"},
-                {"base_name": "Coconut Grove Beach Resort", "type": "mid-range"},
-                {"base_name": "Sea Princess Beach Hotel", "type": "budget"},
-                {"base_name": "Casa Britona", "type": "budget"}
-            ],
-            'bangalore': [
-                {"base_name": "ITC Gardenia", "type": "luxury"},
-                {"base_name": "The Oberoi Bengaluru", "type": "luxury"},
-                {"base_name": "Taj West End", "type": "luxury"},
-                {"base_name": "Radisson Blu Bengaluru", "type": "mid-range"},
-                {"base_name": "Lemon Tree Premier", "type": "mid-range"},
-                {"base_name": "Ibis Bengaluru", "type": "mid-range"},
-                {"base_name": "Hotel Royal Orchid", "type": "budget"},
-                {"base_name": "Treebo Trend Stay", "type": "budget"}
-            ],
-            'default': [
-                {"base_name": "Grand Plaza Hotel", "type": "luxury"},
-                {"base_name": "Royal Heritage Stay", "type": "mid-range"},
-                {"base_name": "City Center Inn", "type": "mid-range"},
-                {"base_name": "Comfort Suites", "type": "budget"}
-            ]
-        }
-        
         dest_key = destination.lower()
-        hotel_templates = destination_hotels.get(dest_key, destination_hotels['default'])
+        hotel_templates = _DESTINATION_HOTELS.get(dest_key, _DESTINATION_HOTELS['default'])
+        
+        hotel_templates = hotel_templates[:6]
+        num_hotels = len(hotel_templates)
+        # Draw each random field for the whole batch in one call
+        rng = rng or random.Random()
+        reviews = rng.choices(range(100, 2501), k=num_hotels)
+        sustainability = rng.choices(_SUSTAINABILITY_LABELS, k=num_hotels)
+        distances = rng.choices(range(1, 11), k=num_hotels)
         
         hotels = []
-        for template in hotel_templates[:6]:
-            price_info = self._get_realistic_pricing(destination, budget, template["base_name"])
+        for i, (base_name, _) in enumerate(hotel_templates):
+            price_info = self._get_realistic_pricing(destination, budget, base_name, rng)
             
             hotel = {
-                "name": template["base_name"],
-                "description": self._generate_hotel_description(template["base_name"], destination, price_info['category']),
+                "name": base_name,
+                "description": self._generate_hotel_description(base_name, destination, price_info['category']),
                 "price_per_night": price_info['price'],
                 "price_range": price_info['category'],
-                "rating": round(random.uniform(3.9, 4.8), 1),
-                "reviews": random.randint(100, 2500),
+                "rating": round(rng.uniform(3.9, 4.8), 1),
+                "reviews": reviews[i],
                 "amenities": self._generate_realistic_amenities(price_info['category']),
                 "location": destination,
-                "url": f"https://example.com/{template['base_name'].replace(' ', '-').lower()}",
+                "url": f"https://example.com/{base_name.replace(' ', '-').lower()}",
                 "type": "Hotel",
-                "sustainability": random.choice(["Eco-friendly", "Green certified", "Standard"]),
-                "distance_center": f"{random.randint(1, 10)} km",
+                "sustainability": sustainability[i],
+                "distance_center": f"{distances[i]} km",
                 "source": "enhanced_mock"
             }
             hotels.append(hotel)
         
         return hotels
     
-    def search_attractions(self, destination: str, preferences: List[str] = None) -> List[Dict[str, Any]]:
+    def search_attractions(self, destination: str, preferences: List[str] = None,
+                           seed: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Search for real attractions with enhanced data
+        Search for real attractions with enhanced data; seed works as in search_hotels
         """
+        rng = random.Random(seed)
         try:
             query = f"tourist attractions places to visit in {destination} India"
-            results = self.ddgs.text(query, max_results=10)
+            results = self._text_search(query, 10)
             
             attractions = []
+            seen_names = set()
             for result in results:
-                attraction = self._parse_attraction_result(result, destination)
-                if attraction and attraction not in attractions:
+                attraction = self._parse_attraction_result(result, destination, rng)
+                if not attraction:
+                    continue
+                name_key = attraction['name'].lower()
+                if name_key not in seen_names:
+                    seen_names.add(name_key)
                     attractions.append(attraction)
             
             # Add destination-specific attractions if needed
             if len(attractions) < 4:
-                default_attractions = self._get_destination_specific_attractions(destination)
+                default_attractions = self._get_destination_specific_attractions(destination, rng)
                 for attr in default_attractions:
-                    if not any(a['name'] == attr['name'] for a in attractions):
+                    name_key = attr['name'].lower()
+                    if name_key not in seen_names:
+                        seen_names.add(name_key)
                         attractions.append(attr)
             
             return attractions[:8]
             
         except Exception as e:
             logger.error(f"Attraction search failed: {str(e)}")
-            return self._get_destination_specific_attractions(destination)
+            return self._get_destination_specific_attractions(destination, rng)
     
-    def _parse_attraction_result(self, result: Dict, destination: str) -> Dict[str, Any]:
+    def _parse_attraction_result(self, result: Dict, destination: str, rng: random.Random) -> Dict[str, Any]:
         """Parse real attraction data from search results"""
         try:
-            title = result.get('title', '')
+            title = _normalize_title(result.get('title', ''))
             description = result.get('body', '')
             
             # Skip if it's a search page or booking site
-            skip_indicators = ['tripadvisor', 'booking.com', 'search results', 'wikipedia']
-            if any(indicator in title.lower() for indicator in skip_indicators):
+            title_lower = title.lower()
+            if any(indicator in title_lower for indicator in _NON_ATTRACTION_INDICATORS):
                 return None
             
             name = self._clean_attraction_name(title)
@@ -314,9 +497,9 @@ class SearchTool:
                 "name": name,
                 "description": description[:200] + "..." if len(description) > 200 else description,
                 "category": self._categorize_attraction(description),
-                "rating": round(random.uniform(3.8, 4.9), 1),
-                "price_range": random.choice(["Free", "$", "$$"]),
-                "duration": f"{random.randint(1, 4)} hours",
+                "rating": round(rng.uniform(3.8, 4.9), 1),
+                "price_range": rng.choice(_ATTRACTION_PRICE_RANGES),
+                "duration": f"{rng.randint(1, 4)} hours",
                 "url": result.get('href', ''),
                 "source": "web_search"
             }
@@ -328,66 +511,40 @@ class SearchTool:
     
     def _clean_attraction_name(self, title: str) -> str:
         """Clean attraction name from search results"""
-        removals = ['- tripadvisor', '- wikipedia', '|', '...', 'things to do in', 'attractions in']
-        name = title
-        for removal in removals:
-            name = name.split(removal)[0].strip()
-        return name
+        return _ATTRACTION_NAME_CUT_PATTERN.split(title, 1)[0].strip()
     
-    def _get_destination_specific_attractions(self, destination: str) -> List[Dict[str, Any]]:
+    def _get_destination_specific_attractions(self, destination: str,
+                                              rng: Optional[random.Random] = None) -> List[Dict[str, Any]]:
         """Get realistic attractions for specific destinations"""
-        attractions_db = {
-            'goa': [
-                {"name": "Calangute Beach", "category": "Beach", "description": "Queen of beaches in Goa, famous for water sports and beach shacks"},
-                {"name": "Basilica of Bom Jesus", "category": "Historical", "description": "UNESCO World Heritage site with Baroque architecture and St. Francis Xavier's tomb"},
-                {"name": "Dudhsagar Falls", "category": "Nature", "description": "Majestic four-tiered waterfall on Mandovi River in the jungle"},
-                {"name": "Fort Aguada", "category": "Historical", "description": "17th-century Portuguese fort with lighthouse overlooking Arabian Sea"},
-                {"name": "Anjuna Flea Market", "category": "Shopping", "description": "Famous Wednesday flea market with clothes, jewelry and handicrafts"},
-                {"name": "Palolem Beach", "category": "Beach", "description": "Scenic crescent-shaped beach in South Goa with silent parties"}
-            ],
-            'bangalore': [
-                {"name": "Lalbagh Botanical Garden", "category": "Nature", "description": "Famous botanical garden with glass house and rare plant species"},
-                {"name": "Bangalore Palace", "category": "Historical", "description": "Royal palace inspired by England's Windsor Castle"},
-                {"name": "Cubbon Park", "category": "Nature", "description": "Historic park in city center perfect for walking and relaxation"},
-                {"name": "ISKCON Temple", "category": "Cultural", "description": "Beautiful Hindu temple dedicated to Lord Krishna"},
-                {"name": "Vidhana Soudha", "category": "Architecture", "description": "Magnificent building housing Karnataka's legislative assembly"},
-                {"name": "Commercial Street", "category": "Shopping", "description": "Popular shopping destination for clothes and accessories"}
-            ]
-        }
+        known_attractions = _DESTINATION_ATTRACTIONS.get(destination.lower(), ())
+        num_attractions = len(known_attractions)
+        rng = rng or random.Random()
+        price_ranges = rng.choices(_ATTRACTION_PRICE_RANGES, k=num_attractions)
+        durations = rng.choices(range(1, 4), k=num_attractions)
         
-        dest_attractions = attractions_db.get(destination.lower(), [])
-        
-        for attraction in dest_attractions:
-            attraction.update({
-                "rating": round(random.uniform(4.0, 4.8), 1),
-                "price_range": random.choice(["Free", "$", "$$"]),
-                "duration": f"{random.randint(1, 3)} hours",
-                "url": f"https://example.com/{destination}-{attraction['name'].replace(' ', '-').lower()}",
+        # Fresh dicts per call: the module table is shared and must not pick up random fields
+        return [
+            {
+                "name": name,
+                "category": category,
+                "description": description,
+                "rating": round(rng.uniform(4.0, 4.8), 1),
+                "price_range": price_range,
+                "duration": f"{duration} hours",
+                "url": f"https://example.com/{destination}-{_ATTRACTION_URL_SLUGS[name]}",
                 "source": "destination_database"
-            })
-        
-        return dest_attractions
+            }
+            for (name, category, description), price_range, duration in zip(known_attractions, price_ranges, durations)
+        ]
     
     def _categorize_attraction(self, description: str) -> str:
         """Categorize attraction based on description"""
         desc_lower = description.lower()
         
-        if any(word in desc_lower for word in ['beach', 'coast', 'shore']):
-            return "Beach"
-        elif any(word in desc_lower for word in ['museum', 'gallery', 'art']):
-            return "Cultural"
-        elif any(word in desc_lower for word in ['park', 'garden', 'nature', 'falls', 'waterfall']):
-            return "Nature"
-        elif any(word in desc_lower for word in ['shopping', 'mall', 'market']):
-            return "Shopping"
-        elif any(word in desc_lower for word in ['temple', 'church', 'mosque', 'religious']):
-            return "Religious"
-        elif any(word in desc_lower for word in ['fort', 'palace', 'historical', 'heritage']):
-            return "Historical"
-        elif any(word in desc_lower for word in ['restaurant', 'food', 'cuisine']):
-            return "Food"
-        else:
-            return "General"
+        for category, keywords in _ATTRACTION_CATEGORY_KEYWORDS:
+            if any(word in desc_lower for word in keywords):
+                return category
+        return "General"
     
     def search_travel_info(self, destination: str, query_type: str = "general") -> List[Dict[str, Any]]:
         """Search for general travel information"""
@@ -400,7 +557,7 @@ class SearchTool:
             }
             
             query = queries.get(query_type, queries["general"])
-            results = self.ddgs.text(query, max_results=3)
+            results = self._text_search(query, 3)
             
             travel_info = []
             for result in results:
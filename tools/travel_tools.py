@@ -1,52 +1,134 @@
 from typing import List, Dict, Any
-from tools.weather_tool import weather_tool
+import asyncio
+import bisect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from tools.weather_tool import get_weather_tool
 from tools.search_tool import search_tool
 from tools.flight_tools import flight_tools
+from config.settings import settings
+from utils.cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Trip scores below each threshold get the matching warning; from the last one up, none
+_WEATHER_WARNING_THRESHOLDS = (30, 50)
+_WEATHER_WARNINGS = ("Poor weather conditions expected", "Moderate weather conditions", None)
+
 class TravelTools:
     def __init__(self):
-        self.weather_tool = weather_tool
         self.search_tool = search_tool
         self.flight_tools = flight_tools
+        self._travel_data_cache = TTLCache(maxsize=1024, ttl=settings.TRAVEL_DATA_CACHE_TTL)
+        self._pending_requests: Dict[tuple, asyncio.Future] = {}
+        # Dedicated pool for the blocking tool calls, sized for I/O wait rather
+        # than CPU count so concurrent plans do not queue behind each other
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=settings.TOOL_THREAD_POOL_SIZE,
+            thread_name_prefix="travel-tools"
+        )
+    
+    @property
+    def weather_tool(self):
+        return get_weather_tool()
     
-    def get_comprehensive_travel_data(self, destination: str, dates: str, 
+    async def get_comprehensive_travel_data(self, destination: str, dates: str, 
                                     budget: float, preferences: List[str],
                                     origin_city: str = "New York") -> Dict[str, Any]:
         """
         Get all travel-related data with proper error handling and consistent scoring
         """
         try:
-            logger.info(f"Collecting comprehensive travel data for {destination}")
+            # Weather, hotel, attraction and flight data for the same trip request is
+            # stable for minutes, so repeat plans and feedback re-searches skip the network
+            cache_key = (
+                destination.lower().strip(),
+                dates,
+                round(budget or 0, -1),
+                tuple(sorted(preferences or [])),
+                origin_city.lower().strip()
+            )
+            cached = self._travel_data_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached travel data for %s", destination)
+                return cached
+            
+            # Coalesce identical requests already in flight on this event loop (e.g.
+            # from plan_trips_batch): later callers await the first caller's result
+            # instead of repeating the same API calls
+            loop = asyncio.get_running_loop()
+            pending_key = (loop, cache_key)
+            pending = self._pending_requests.get(pending_key)
+            if pending is not None:
+                logger.info("Joining in-flight travel data request for %s", destination)
+                return await asyncio.shield(pending)
+            
+            future = loop.create_future()
+            self._pending_requests[pending_key] = future
+            try:
+                travel_data = await self._collect_travel_data(destination, dates, budget, preferences, origin_city)
+                future.set_result(travel_data)
+            finally:
+                if not future.done():
+                    future.cancel()
+                del self._pending_requests[pending_key]
+            
+            if travel_data.get('status') == 'success':
+                self._travel_data_cache.set(cache_key, travel_data)
+            return travel_data
+            
+        except Exception as e:
+            logger.error("Comprehensive travel data collection failed: %s", e)
+            return {
+                "status": "error",
+                "error": f"Travel data collection failed: {str(e)}"
+            }
+    
+    async def _collect_travel_data(self, destination: str, dates: str, budget: float,
+                                   preferences: List[str], origin_city: str) -> Dict[str, Any]:
+        try:
+            logger.info("Collecting comprehensive travel data for %s", destination)
             
             # Parse dates for extended weather analysis
             date_parts = dates.split(' to ')
             start_date = date_parts[0]
             end_date = date_parts[1] if len(date_parts) > 1 else start_date
             
-            # Get enhanced weather data with consistent scoring
-            weather_data = self.weather_tool.get_extended_weather_forecast(destination, start_date, end_date)
-            weather_analysis = weather_data.get('weather_analysis', 'Weather information not available')
-            
-            # Get hotel options with enhanced search
-            hotels = self.search_tool.search_hotels(destination, budget)
+            # BLOCKING: the tools wrap sync HTTP clients (requests, DDGS) with no async
+            # variant, so each lookup runs in a worker thread. This keeps the event
+            # loop free for other planning runs, and the five requests overlap
+            # instead of running back to back
+            loop = asyncio.get_running_loop()
+            run_blocking = partial(loop.run_in_executor, self._io_executor)
+            results = await asyncio.gather(
+                run_blocking(self.weather_tool.get_extended_weather_forecast, destination, start_date, end_date),
+                run_blocking(self.search_tool.search_hotels, destination, budget),
+                run_blocking(self.search_tool.search_attractions, destination, preferences),
+                run_blocking(self.flight_tools.search_flights, origin_city, destination, start_date, budget),
+                run_blocking(self.search_tool.search_travel_info, destination, "general"),
+                return_exceptions=True
+            )
             
-            # Get attractions with enhanced search
-            attractions = self.search_tool.search_attractions(destination, preferences)
+            # Weather drives the go/no-go decision, so without it the collection fails;
+            # any other lookup that raised degrades to no results instead
+            if isinstance(results[0], Exception):
+                raise results[0]
+            lookups = ("hotels", "attractions", "flights", "travel info")
+            empty_results = ([], [], {}, [])
+            for i, (lookup, empty) in enumerate(zip(lookups, empty_results), start=1):
+                if isinstance(results[i], Exception):
+                    logger.warning("%s lookup failed for %s: %s", lookup.capitalize(), destination, results[i])
+                    results[i] = empty
+            weather_data, hotels, attractions, flight_result, travel_info = results
             
-            # Get flight options with real search
-            flight_result = self.flight_tools.search_flights(origin_city, destination, start_date, budget)
+            weather_analysis = weather_data.get('weather_analysis', 'Weather information not available')
             flight_list = flight_result.get('flights', [])
             
-            # Get general travel info
-            travel_info = self.search_tool.search_travel_info(destination, "general")
-            
             # Calculate viability with consistent scoring
             viability = self.check_weather_viability(weather_data)
             
-            return {
+            travel_data = {
                 "weather_data": weather_data,
                 "weather_analysis": weather_analysis,
                 "weather_viability": viability,
@@ -57,9 +139,10 @@ class TravelTools:
                 "destination": destination,
                 "status": "success"
             }
+            return travel_data
             
         except Exception as e:
-            logger.error(f"Comprehensive travel data collection failed: {str(e)}")
+            logger.error("Comprehensive travel data collection failed: %s", e)
             return {
                 "status": "error",
                 "error": f"Travel data collection failed: {str(e)}"
@@ -88,20 +171,15 @@ class TravelTools:
             trip_score = weather_data.get('viability_score', 50)
             recommendation = weather_data.get('viability_reason', '')
         
-        viability = {
+        # Add warnings for poor conditions
+        warning = _WEATHER_WARNINGS[bisect.bisect_right(_WEATHER_WARNING_THRESHOLDS, trip_score)]
+        
+        return {
             "viable": trip_score >= 40,  # Consider viable if score >= 40
             "score": trip_score,
             "reason": recommendation,
-            "warnings": [],
+            "warnings": [warning] if warning else [],
             "recommendations": weather_data.get('recommendations', [])
         }
-        
-        # Add warnings for poor conditions
-        if trip_score < 30:
-            viability["warnings"].append("Poor weather conditions expected")
-        elif trip_score < 50:
-            viability["warnings"].append("Moderate weather conditions")
-        
-        return viability
 
 travel_tools = TravelTools()
\ No newline at end of file
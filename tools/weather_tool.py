@@ -1,22 +1,183 @@
+import bisect
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
 from config.settings import settings
-from datetime import datetime, timedelta
+from utils.cache import TTLCache
+from datetime import date, timedelta
+from collections import Counter
+from itertools import groupby, islice
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+_WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Weather description keywords, checked in order; the first group that matches
+# decides. Plain substring checks, so 'cloud' also covers 'broken clouds'
+
+# (keywords, score change, reason, recommendation) for the trip viability score
+_VIABILITY_CONDITIONS = (
+    (('clear', 'sunny', 'fair'), 20, "Excellent weather conditions", None),
+    (('cloud', 'overcast'), 5, "Cloudy but suitable", None),
+    (('drizzle', 'light rain'), -10, "Light rain expected", "Carry umbrella or raincoat"),
+    (('rain', 'shower'), -25, "Rain expected", "Plan indoor activities"),
+    (('storm', 'thunder'), -50, "Storm conditions", "Consider rescheduling - storm warning"),
+    (('snow', 'ice'), -30, "Snow conditions", "Check travel advisories")
+)
+
+# (keywords, score change) for the daily suitability score
+_DAILY_CONDITION_ADJUSTMENTS = (
+    (('storm', 'hurricane', 'tornado'), -50),
+    (('heavy rain', 'thunderstorm'), -40),
+    (('rain', 'shower'), -20),
+    (('snow', 'sleet'), -30),
+    (('clear', 'sunny'), 15),
+    (('cloud',), 5)
+)
+
+# (keywords, activity recommendations) for each forecast day
+_DAILY_CONDITION_RECOMMENDATIONS = (
+    (('rain', 'drizzle'), ("Carry umbrella", "Waterproof footwear", "Have indoor backup plans")),
+    (('storm', 'thunder'), ("Avoid outdoor activities", "Seek shelter if needed", "Check weather alerts")),
+    (('clear', 'sunny'), ("Perfect for outdoor activities", "Sunscreen recommended", "Great for photography"))
+)
+_HOT_DAY_RECOMMENDATIONS = ("Stay hydrated", "Wear light clothing", "Seek shade during peak hours")
+_COLD_DAY_RECOMMENDATIONS = ("Warm layers needed", "Limit outdoor exposure", "Hot beverages recommended")
+_DEFAULT_DAY_RECOMMENDATIONS = ("Generally good conditions for activities",)
+
+def _first_matching_condition(conditions: tuple, description: str) -> Optional[tuple]:
+    """The first (keywords, ...) entry with a keyword in description, or None"""
+    for condition in conditions:
+        if any(word in description for word in condition[0]):
+            return condition
+    return None
+
+# OpenWeather uses a small fixed vocabulary of descriptions, so after the first
+# few lookups each description's condition is a cache hit rather than a scan
+@lru_cache(maxsize=256)
+def _viability_condition(description: str) -> Optional[tuple]:
+    return _first_matching_condition(_VIABILITY_CONDITIONS, description)
+
+@lru_cache(maxsize=256)
+def _daily_condition_adjustment(description: str) -> int:
+    condition = _first_matching_condition(_DAILY_CONDITION_ADJUSTMENTS, description)
+    return condition[1] if condition else 0
+
+@lru_cache(maxsize=256)
+def _daily_condition_recommendations(description: str) -> tuple:
+    condition = _first_matching_condition(_DAILY_CONDITION_RECOMMENDATIONS, description)
+    return condition[1] if condition else ()
+
+@lru_cache(maxsize=256)
+def _daily_recommendations(temp_band: int, description: str) -> tuple:
+    """Recommendations for a day by temperature band (1 hot, -1 cold, 0 mild) and description"""
+    temp_recommendations = {1: _HOT_DAY_RECOMMENDATIONS, -1: _COLD_DAY_RECOMMENDATIONS}.get(temp_band, ())
+    return (temp_recommendations + _daily_condition_recommendations(description)) or _DEFAULT_DAY_RECOMMENDATIONS
+
+# Score thresholds and the label for each band between them, lowest first
+_SUITABILITY_THRESHOLDS = (20, 40, 60, 80)
+_SUITABILITY_LEVELS = ("Very Poor", "Poor", "Fair", "Good", "Excellent")
+_OVERALL_RECOMMENDATION_THRESHOLDS = (40, 60, 80)
+_OVERALL_RECOMMENDATIONS = (
+    "Poor weather conditions - consider rescheduling or indoor alternatives.",
+    "Fair weather - some days may require alternative plans.",
+    "Good weather conditions with minor considerations.",
+    "Excellent weather conditions for your trip!"
+)
+
 class WeatherTool:
     def __init__(self):
         self.api_key = settings.OPENWEATHER_API_KEY
         self.base_url = settings.OPENWEATHER_BASE_URL
+        # Keep-alive session shared by the geocode, current and forecast calls, so
+        # only the first request to the API pays for TCP and TLS setup. The pool
+        # matches the tool thread pool, since calls run from those threads.
+        # Transient failures are retried on a short, bounded backoff; Retry-After
+        # is ignored so a rate-limited API can't stall a planning run
+        self.session = requests.Session()
+        retries = Retry(
+            total=settings.HTTP_RETRIES,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_maxsize=settings.TOOL_THREAD_POOL_SIZE, max_retries=retries)
+        self.timeout = (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_TIMEOUT)
+        # Conditions change slowly, so repeat plans for a city reuse recent lookups.
+        # Failed lookups are not cached
+        self._forecast_cache = TTLCache(maxsize=512, ttl=settings.WEATHER_CACHE_TTL)
+        self._5day_cache = TTLCache(maxsize=512, ttl=settings.WEATHER_CACHE_TTL)
+        # Runs the 5-day forecast request while the calling thread does the city lookup
+        self._forecast_executor = ThreadPoolExecutor(
+            max_workers=settings.TOOL_THREAD_POOL_SIZE,
+            thread_name_prefix="weather-forecast"
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def get_weather_forecast(self, city: str, date: str = None) -> Dict[str, Any]:
         """
         Get weather forecast for a city using OpenWeatherMap API
         """
         try:
-            # First, get coordinates for the city
+            raw = self._fetch_weather_raw(city)
+            if "error" in raw:
+                return raw
+            
+            current_weather = raw['current_weather']
+            forecast = raw['forecast']
+            
+            # Analyze weather conditions
+            weather_analysis = self.analyze_weather_conditions(raw)
+            
+            # Calculate viability score
+            viability = self._calculate_viability_score(current_weather, forecast)
+            
+            return {
+                "city": raw['city'],
+                "current_weather": current_weather,
+                "forecast": forecast,
+                "weather_analysis": weather_analysis,
+                "viability_score": viability["score"],
+                "viability_reason": viability["reason"],
+                "recommendations": viability["recommendations"],
+                "coordinates": raw['coordinates']
+            }
+            
+        except Exception as e:
+            logger.error(f"Weather API error: {str(e)}")
+            return {"error": f"Weather API error: {str(e)}"}
+    
+    def get_weather_forecasts_batch(self, cities: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get weather forecasts for several cities at once, keyed by city
+        """
+        if not cities:
+            return {}
+        
+        # Each lookup is network-bound, so a handful of cities cost about as long as one.
+        # A separate pool, since each lookup itself waits on the forecast executor
+        with ThreadPoolExecutor(max_workers=min(8, len(cities)), thread_name_prefix="weather-batch") as executor:
+            return dict(zip(cities, executor.map(self.get_weather_forecast, cities)))  # BLOCKING
+    
+    def _fetch_weather_raw(self, city: str) -> Dict[str, Any]:
+        """Current weather, 5-day forecast and coordinates for a city, without any analysis"""
+        cache_key = city.lower().strip()
+        cached = self._forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Both endpoints take the city name, so the forecast doesn't have to
+            # wait for the lookup's coordinates and the two requests overlap
+            forecast_future = self._forecast_executor.submit(self._get_5day_forecast, city)  # BLOCKING
+            
             geo_url = f"{self.base_url}/weather"
             geo_params = {
                 'q': city,
@@ -24,40 +185,28 @@ class WeatherTool:
                 'units': 'metric'
             }
             
-            geo_response = requests.get(geo_url, params=geo_params)
+            geo_response = self.session.get(geo_url, params=geo_params, timeout=self.timeout)  # BLOCKING
             if geo_response.status_code != 200:
+                forecast_future.cancel()
                 return {"error": f"Could not find weather data for {city}"}
             
-            geo_data = geo_response.json()
-            lat = geo_data['coord']['lat']
-            lon = geo_data['coord']['lon']
+            geo_data = orjson.loads(geo_response.content)
             
-            # Get current weather
-            current_weather = self._get_current_weather(lat, lon)
+            # The city lookup already is the current weather at those coordinates
+            current_weather = self._parse_current_weather(geo_data)
             
             # Get 5-day forecast
-            forecast = self._get_5day_forecast(lat, lon)
-            
-            # Analyze weather conditions
-            weather_analysis = self.analyze_weather_conditions({
-                "city": city,
-                "current_weather": current_weather,
-                "forecast": forecast
-            })
+            forecast = forecast_future.result()  # BLOCKING
             
-            # Calculate viability score
-            viability = self._calculate_viability_score(current_weather, forecast)
-            
-            return {
+            raw = {
                 "city": city,
                 "current_weather": current_weather,
                 "forecast": forecast,
-                "weather_analysis": weather_analysis,
-                "viability_score": viability["score"],
-                "viability_reason": viability["reason"],
-                "recommendations": viability["recommendations"],
-                "coordinates": {"lat": lat, "lon": lon}
+                "coordinates": {"lat": geo_data['coord']['lat'], "lon": geo_data['coord']['lon']}
             }
+            if "error" not in current_weather and forecast:
+                self._forecast_cache.set(cache_key, raw)
+            return raw
             
         except Exception as e:
             logger.error(f"Weather API error: {str(e)}")
@@ -68,24 +217,28 @@ class WeatherTool:
         Get extended weather forecast for trip duration with consistent scoring
         """
         try:
-            basic_forecast = self.get_weather_forecast(city)
+            raw = self._fetch_weather_raw(city)
             
-            if "error" in basic_forecast:
-                return basic_forecast
+            if "error" in raw:
+                return raw
             
             # Parse dates
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            start_dt = date.fromisoformat(start_date)
+            end_dt = date.fromisoformat(end_date)
             duration = (end_dt - start_dt).days + 1
             
             # Create daily forecasts
             daily_forecasts = []
-            current_weather = basic_forecast.get('current_weather', {})
-            forecast_data = basic_forecast.get('forecast', [])
+            current_weather = raw['current_weather']
+            forecast_data = raw['forecast']
             
+            # Days past the forecast all repeat the current conditions, so each
+            # distinct (temp, description, wind) is only scored once
+            day_scores = {}
             for day in range(duration):
-                forecast_date = (start_dt + timedelta(days=day)).strftime('%Y-%m-%d')
-                day_name = (start_dt + timedelta(days=day)).strftime('%A')
+                day_dt = start_dt + timedelta(days=day)
+                forecast_date = day_dt.isoformat()
+                day_name = _WEEKDAY_NAMES[day_dt.weekday()]
                 
                 # Use forecast data if available, otherwise use current weather
                 if day < len(forecast_data) and forecast_data:
@@ -99,7 +252,17 @@ class WeatherTool:
                     wind_speed = current_weather.get('wind_speed', 5)
                 
                 # Calculate daily score
-                daily_score = self._calculate_daily_suitability_score(temp, description, wind_speed, 0)
+                conditions = (temp, description, wind_speed)
+                scored = day_scores.get(conditions)
+                if scored is None:
+                    desc_lower = description.lower()
+                    daily_score = self._calculate_daily_suitability_score(temp, description, wind_speed, 0, desc_lower)
+                    scored = day_scores[conditions] = (
+                        daily_score,
+                        self._get_suitability_level(daily_score),
+                        self._get_daily_recommendations(temp, description, 0, desc_lower)
+                    )
+                daily_score, suitability_level, recommendations = scored
                 
                 daily_forecasts.append({
                     'date': forecast_date,
@@ -108,24 +271,37 @@ class WeatherTool:
                     'description': description,
                     'wind_speed': wind_speed,
                     'suitability_score': daily_score,
-                    'suitability_level': self._get_suitability_level(daily_score),
-                    'recommendations': self._get_daily_recommendations(temp, description, 0)
+                    'suitability_level': suitability_level,
+                    'recommendations': list(recommendations)
                 })
             
+            viability = self._calculate_viability_score(current_weather, forecast_data)
+            
             # Calculate overall trip score - FIXED: Use proper averaging
             daily_scores = [day['suitability_score'] for day in daily_forecasts]
-            overall_score = sum(daily_scores) / len(daily_scores) if daily_scores else basic_forecast.get('viability_score', 50)
+            overall_score = sum(daily_scores) / len(daily_scores) if daily_scores else viability["score"]
             
-            # Ensure the basic forecast has the correct viability score
-            basic_forecast['viability_score'] = overall_score
+            overall_level = self._get_suitability_level(overall_score)
+            
+            # Analyze once the trip score is known, so the text matches the score returned
+            weather_analysis = self.analyze_weather_conditions({**raw, "viability_score": overall_score})
             
             return {
-                **basic_forecast,
+                "city": raw['city'],
+                "current_weather": current_weather,
+                "forecast": forecast_data,
+                "weather_analysis": weather_analysis,
+                "viability_score": overall_score,
+                "viability_reason": viability["reason"],
+                "recommendations": viability["recommendations"],
+                "coordinates": raw['coordinates'],
                 "extended_analysis": {
                     "daily_forecasts": daily_forecasts,
                     "trip_duration": duration,
                     "overall_trip_score": overall_score,  # FIXED: Consistent scoring
-                    "overall_recommendation": self._get_overall_recommendation(overall_score)
+                    "overall_recommendation": self._get_overall_recommendation(overall_score),
+                    "overall_level": overall_level,
+                    "display_text": f"{overall_score}/100 - {overall_level}"
                 }
             }
             
@@ -162,28 +338,13 @@ class WeatherTool:
             reasons.append("Uncomfortable temperature")
         
         # Weather condition scoring
-        if any(word in description for word in ['clear', 'sunny', 'fair']):
-            score += 20
-            reasons.append("Excellent weather conditions")
-        elif any(word in description for word in ['cloud', 'overcast']):
-            score += 5
-            reasons.append("Cloudy but suitable")
-        elif any(word in description for word in ['drizzle', 'light rain']):
-            score -= 10
-            reasons.append("Light rain expected")
-            recommendations.append("Carry umbrella or raincoat")
-        elif any(word in description for word in ['rain', 'shower']):
-            score -= 25
-            reasons.append("Rain expected")
-            recommendations.append("Plan indoor activities")
-        elif any(word in description for word in ['storm', 'thunder']):
-            score -= 50
-            reasons.append("Storm conditions")
-            recommendations.append("Consider rescheduling - storm warning")
-        elif any(word in description for word in ['snow', 'ice']):
-            score -= 30
-            reasons.append("Snow conditions")
-            recommendations.append("Check travel advisories")
+        condition = _viability_condition(description)
+        if condition:
+            _, score_change, reason, recommendation = condition
+            score += score_change
+            reasons.append(reason)
+            if recommendation:
+                recommendations.append(recommendation)
         
         # Wind scoring
         if wind_speed > 20:
@@ -195,7 +356,7 @@ class WeatherTool:
             reasons.append("Moderate winds")
         
         # Ensure score is within bounds
-        score = max(0, min(100, score))
+        score = 0 if score < 0 else 100 if score > 100 else score
         
         return {
             "score": score,
@@ -203,54 +364,55 @@ class WeatherTool:
             "recommendations": recommendations
         }
     
-    def _get_current_weather(self, lat: float, lon: float) -> Dict[str, Any]:
-        url = f"{self.base_url}/weather"
-        params = {
-            'lat': lat,
-            'lon': lon,
-            'appid': self.api_key,
-            'units': 'metric'
-        }
-        
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
+    def _parse_current_weather(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Current conditions from a /weather response"""
+        try:
             return {
                 "temperature": data['main']['temp'],
                 "feels_like": data['main']['feels_like'],
                 "humidity": data['main']['humidity'],
                 "description": data['weather'][0]['description'],
                 "wind_speed": data['wind']['speed'],
-                "visibility": data.get('visibility', 'N/A')
+                "visibility": data.get('visibility')  # metres, or None if not reported
             }
-        return {"error": "Could not fetch current weather"}
+        except (KeyError, IndexError, TypeError):
+            return {"error": "Could not fetch current weather"}
     
-    def _get_5day_forecast(self, lat: float, lon: float) -> List[Dict[str, Any]]:
+    def _get_5day_forecast(self, city: str) -> List[Dict[str, Any]]:
+        cache_key = city.lower().strip()
+        cached = self._5day_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         url = f"{self.base_url}/forecast"
         params = {
-            'lat': lat,
-            'lon': lon,
+            'q': city,
             'appid': self.api_key,
             'units': 'metric'
         }
         
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=self.timeout)  # BLOCKING
         forecasts = []
         
         if response.status_code == 200:
-            data = response.json()
-            # Get one forecast per day for next 5 days
-            for i in range(0, min(5 * 8, len(data['list'])), 8):
-                item = data['list'][i]
+            data = orjson.loads(response.content)
+            # One forecast per day for the next 5 days, averaged over the day's
+            # 3-hourly slots rather than taken from whichever slot comes first
+            days = groupby(data['list'], key=lambda item: item['dt_txt'][:10])
+            for _, items in islice(days, 5):
+                items = list(items)
+                count = len(items)
                 forecasts.append({
-                    "datetime": item['dt_txt'],
-                    "temperature": item['main']['temp'],
-                    "description": item['weather'][0]['description'],
-                    "humidity": item['main']['humidity'],
-                    "wind_speed": item['wind']['speed']
+                    "datetime": items[0]['dt_txt'],
+                    "temperature": round(sum(item['main']['temp'] for item in items) / count, 2),
+                    "description": Counter(item['weather'][0]['description'] for item in items).most_common(1)[0][0],
+                    "humidity": round(sum(item['main']['humidity'] for item in items) / count),
+                    "wind_speed": round(sum(item['wind']['speed'] for item in items) / count, 2)
                 })
+            if forecasts:
+                self._5day_cache.set(cache_key, forecasts)
         
-        return forecasts
+        return list(forecasts)
     
     def analyze_weather_conditions(self, weather_data: Dict[str, Any]) -> str:
         """
@@ -291,7 +453,8 @@ class WeatherTool:
         
         return analysis
     
-    def _calculate_daily_suitability_score(self, temp: float, description: str, wind: float, rain_prob: float) -> float:
+    def _calculate_daily_suitability_score(self, temp: float, description: str, wind: float, rain_prob: float,
+                                           desc_lower: Optional[str] = None) -> float:
         """Calculate daily weather suitability score"""
         score = 100
         
@@ -306,19 +469,9 @@ class WeatherTool:
             score += 10
         
         # Weather condition adjustments
-        desc_lower = description.lower()
-        if any(word in desc_lower for word in ['storm', 'hurricane', 'tornado']):
-            score -= 50
-        elif any(word in desc_lower for word in ['heavy rain', 'thunderstorm']):
-            score -= 40
-        elif any(word in desc_lower for word in ['rain', 'shower']):
-            score -= 20
-        elif any(word in desc_lower for word in ['snow', 'sleet']):
-            score -= 30
-        elif any(word in desc_lower for word in ['clear', 'sunny']):
-            score += 15
-        elif 'cloud' in desc_lower:
-            score += 5
+        if desc_lower is None:
+            desc_lower = description.lower()
+        score += _daily_condition_adjustment(desc_lower)
         
         # Wind adjustments
         if wind > 25:
@@ -326,50 +479,23 @@ class WeatherTool:
         elif wind > 15:
             score -= 10
         
-        return max(0, min(100, score))
+        return 0 if score < 0 else 100 if score > 100 else score
     
     def _get_suitability_level(self, score: float) -> str:
         """Convert score to suitability level"""
-        if score >= 80:
-            return "Excellent"
-        elif score >= 60:
-            return "Good"
-        elif score >= 40:
-            return "Fair"
-        elif score >= 20:
-            return "Poor"
-        else:
-            return "Very Poor"
+        return _SUITABILITY_LEVELS[bisect.bisect_right(_SUITABILITY_THRESHOLDS, score)]
     
-    def _get_daily_recommendations(self, temp: float, description: str, rain_prob: float) -> List[str]:
+    def _get_daily_recommendations(self, temp: float, description: str, rain_prob: float,
+                                   desc_lower: Optional[str] = None) -> List[str]:
         """Get daily activity recommendations"""
-        recommendations = []
-        desc_lower = description.lower()
-        
-        if temp > 30:
-            recommendations.extend(["Stay hydrated", "Wear light clothing", "Seek shade during peak hours"])
-        elif temp < 10:
-            recommendations.extend(["Warm layers needed", "Limit outdoor exposure", "Hot beverages recommended"])
-        
-        if any(word in desc_lower for word in ['rain', 'drizzle']):
-            recommendations.extend(["Carry umbrella", "Waterproof footwear", "Have indoor backup plans"])
-        elif any(word in desc_lower for word in ['storm', 'thunder']):
-            recommendations.extend(["Avoid outdoor activities", "Seek shelter if needed", "Check weather alerts"])
-        elif 'clear' in desc_lower or 'sunny' in desc_lower:
-            recommendations.extend(["Perfect for outdoor activities", "Sunscreen recommended", "Great for photography"])
-        
-        return recommendations if recommendations else ["Generally good conditions for activities"]
+        temp_band = 1 if temp > 30 else -1 if temp < 10 else 0
+        if desc_lower is None:
+            desc_lower = description.lower()
+        return list(_daily_recommendations(temp_band, desc_lower))
     
     def _get_overall_recommendation(self, score: float) -> str:
         """Get overall recommendation based on score"""
-        if score >= 80:
-            return "Excellent weather conditions for your trip!"
-        elif score >= 60:
-            return "Good weather conditions with minor considerations."
-        elif score >= 40:
-            return "Fair weather - some days may require alternative plans."
-        else:
-            return "Poor weather conditions - consider rescheduling or indoor alternatives."
+        return _OVERALL_RECOMMENDATIONS[bisect.bisect_right(_OVERALL_RECOMMENDATION_THRESHOLDS, score)]
     
     def get_consistent_weather_score(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure consistent weather scoring across the application"""
@@ -381,22 +507,22 @@ class WeatherTool:
         if extended_analysis and 'overall_trip_score' in extended_analysis:
             score = extended_analysis['overall_trip_score']
             recommendation = extended_analysis.get('overall_recommendation', '')
+            
+            # Level and display text are stored when the extended forecast is built
+            if 'overall_level' in extended_analysis:
+                return {
+                    "score": score,
+                    "level": extended_analysis['overall_level'],
+                    "recommendation": recommendation,
+                    "display_text": extended_analysis['display_text']
+                }
         else:
             # Fallback to basic viability score
             score = weather_data.get('viability_score', 50)
             recommendation = weather_data.get('viability_reason', '')
         
         # Convert score to level
-        if score >= 80:
-            level = "Excellent"
-        elif score >= 60:
-            level = "Good" 
-        elif score >= 40:
-            level = "Fair"
-        elif score >= 20:
-            level = "Poor"
-        else:
-            level = "Very Poor"
+        level = self._get_suitability_level(score)
         
         return {
             "score": score,
@@ -405,4 +531,13 @@ class WeatherTool:
             "display_text": f"{score}/100 - {level}"
         }
 
-weather_tool = WeatherTool()
\ No newline at end of file
+# Built on first use, so importing the module doesn't open a session or pool
+@lru_cache(maxsize=1)
+def get_weather_tool() -> WeatherTool:
+    return WeatherTool()
+
+def __getattr__(name: str):
+    # Keeps `from tools.weather_tool import weather_tool` working, lazily
+    if name == "weather_tool":
+        return get_weather_tool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .helpers import format_itinerary_display, validate_user_input, create_sample_itinerary
+from .cache import TTLCache
 
-__all__ = ["format_itinerary_display", "validate_user_input", "create_sample_itinerary"]
\ No newline at end of file
+__all__ = ["format_itinerary_display", "validate_user_input", "create_sample_itinerary", "TTLCache"]
\ No newline at end of file
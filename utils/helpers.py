@@ -1,27 +1,29 @@
 import json
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import date, datetime
 
 def format_itinerary_display(itinerary_data: Dict[str, Any]) -> str:
     """Format the itinerary for display with consistent weather scoring"""
-    if not itinerary_data.get('itinerary'):
+    # One bound lookup for the many top-level reads below
+    get = itinerary_data.get
+    if not get('itinerary'):
         return "No itinerary generated."
     
-    formatted_output = f"""
+    parts = [f"""
     🗺️ TRAVEL ITINERARY
     ===================
     
-    Destination: {itinerary_data.get('destination', 'Unknown')}
-    Duration: {itinerary_data.get('duration', 'Unknown')} days
-    Travel Type: {itinerary_data.get('travel_type', 'Leisure')}
+    Destination: {get('destination', 'Unknown')}
+    Duration: {get('duration', 'Unknown')} days
+    Travel Type: {get('travel_type', 'Leisure')}
     
     📋 ITINERARY:
-    {itinerary_data.get('itinerary', 'No itinerary available')}
+    {get('itinerary', 'No itinerary available')}
     
-    """
+    """]
     
     # FIXED: Single consistent weather score display
-    weather_data = itinerary_data.get('weather_data', {})
+    weather_data = get('weather_data', {})
     if weather_data and 'error' not in weather_data:
         # Get the correct viability score - use extended analysis score first
         extended_analysis = weather_data.get('extended_analysis', {})
@@ -35,65 +37,72 @@ def format_itinerary_display(itinerary_data: Dict[str, Any]) -> str:
             display_score = weather_data.get('viability_score', 50)
             overall_recommendation = weather_data.get('viability_reason', '')
         
-        weather_analysis = itinerary_data.get('weather_analysis', '')
+        weather_analysis = get('weather_analysis', '')
         
         # Clean up the weather analysis to remove duplicate scores
         weather_analysis_clean = weather_analysis.split('Weather viability score:')[0].strip()
         
-        formatted_output += f"""
+        parts.append(f"""
     🌤️ WEATHER ANALYSIS:
     {weather_analysis_clean}
     
     Overall Weather Score: {display_score}/100 - {overall_recommendation}
-    """
+    """)
         
         # Add extended forecast if available
         if extended_analysis and 'daily_forecasts' in extended_analysis:
-            formatted_output += "\n    📅 DAILY WEATHER FORECAST:\n"
-            for day in extended_analysis['daily_forecasts']:
-                formatted_output += f"    • {day['day_name']}: {day['description'].title()}, {day['temperature']}°C ({day['suitability_level']})\n"
+            parts.append("\n    📅 DAILY WEATHER FORECAST:\n")
+            parts.extend(
+                f"    • {day['day_name']}: {day['description'].title()}, {day['temperature']}°C ({day['suitability_level']})\n"
+                for day in extended_analysis['daily_forecasts']
+            )
     
     # Add enhanced hotel options
-    hotels = itinerary_data.get('hotel_options', [])
-    if hotels and isinstance(hotels, list) and len(hotels) > 0:
-        formatted_output += "\n    🏨 ACCOMMODATION OPTIONS:\n"
+    hotels = get('hotel_options', [])
+    if hotels and isinstance(hotels, list):
+        parts.append("\n    🏨 ACCOMMODATION OPTIONS:\n")
         for i, hotel in enumerate(hotels[:4], 1):
-            formatted_output += f"    {i}. {hotel.get('name', 'Unknown Hotel')}\n"
-            formatted_output += f"       💰 ${hotel.get('price_per_night', 'N/A')}/night | ⭐ {hotel.get('rating', 'N/A')}/5\n"
-            formatted_output += f"       📍 {hotel.get('distance_center', 'Unknown')} from center\n"
-            formatted_output += f"       🏷️ {hotel.get('price_range', 'Standard').title()}\n"
+            hotel_get = hotel.get
+            parts.append(
+                f"    {i}. {hotel_get('name', 'Unknown Hotel')}\n"
+                f"       💰 ${hotel_get('price_per_night', 'N/A')}/night | ⭐ {hotel_get('rating', 'N/A')}/5\n"
+                f"       📍 {hotel_get('distance_center', 'Unknown')} from center\n"
+                f"       🏷️ {hotel_get('price_range', 'Standard').title()}\n"
+            )
             
             # Show top 3 amenities
-            amenities = hotel.get('amenities', [])[:3]
+            amenities = hotel_get('amenities', [])[:3]
             if amenities:
-                formatted_output += f"       ✅ {', '.join(amenities)}\n"
+                parts.append(f"       ✅ {', '.join(amenities)}\n")
             
-            formatted_output += "\n"
+            parts.append("\n")
     
     # Add flight information if available
-    flights = itinerary_data.get('flight_options', [])
-    if flights and isinstance(flights, list) and len(flights) > 0:
-        formatted_output += "    ✈️ FLIGHT OPTIONS:\n"
+    flights = get('flight_options', [])
+    if flights and isinstance(flights, list):
+        parts.append("    ✈️ FLIGHT OPTIONS:\n")
         for i, flight in enumerate(flights[:3], 1):
-            formatted_output += f"    {i}. {flight.get('airline', 'Unknown')} - ${flight.get('price', 'N/A')}\n"
-            formatted_output += f"       🕒 {flight.get('departure_time', '')} to {flight.get('arrival_time', '')}\n"
-            formatted_output += f"       ⏱️ {flight.get('duration', 'Unknown')}"
+            flight_get = flight.get
+            parts.append(
+                f"    {i}. {flight_get('airline', 'Unknown')} - ${flight_get('price', 'N/A')}\n"
+                f"       🕒 {flight_get('departure_time', '')} to {flight_get('arrival_time', '')}\n"
+                f"       ⏱️ {flight_get('duration', 'Unknown')}"
+            )
             
             # Add layover info if applicable
-            layovers = flight.get('layovers', 0)
+            layovers = flight_get('layovers', 0)
             if layovers > 0:
-                formatted_output += f" | 🛑 {layovers} stop{'s' if layovers > 1 else ''}"
+                parts.append(f" | 🛑 {layovers} stop{'s' if layovers > 1 else ''}")
             
-            formatted_output += "\n\n"
+            parts.append("\n\n")
     
     # Add alternative suggestions if any
-    alternatives = itinerary_data.get('alternative_suggestions', [])
+    alternatives = get('alternative_suggestions', [])
     if alternatives:
-        formatted_output += "    💡 ALTERNATIVE SUGGESTIONS:\n"
-        for i, alt in enumerate(alternatives, 1):
-            formatted_output += f"    {i}. {alt}\n"
+        parts.append("    💡 ALTERNATIVE SUGGESTIONS:\n")
+        parts.extend(f"    {i}. {alt}\n" for i, alt in enumerate(alternatives, 1))
     
-    return formatted_output
+    return "".join(parts)
 
 def validate_user_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate user input data"""
@@ -102,8 +111,21 @@ def validate_user_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
     if not input_data.get('destination'):
         errors.append("Destination is required")
     
-    if not input_data.get('travel_dates'):
+    travel_dates = input_data.get('travel_dates')
+    if not travel_dates:
         errors.append("Travel dates are required")
+    else:
+        try:
+            start, _, end = travel_dates.partition(' to ')
+            start_date = date.fromisoformat(start)
+            end_date = date.fromisoformat(end) if end else start_date
+            
+            if end_date <= start_date:
+                errors.append("Please select valid travel dates")
+            if start_date <= date.today():
+                errors.append("Start date must be in the future")
+        except ValueError:
+            errors.append("Travel dates must be in YYYY-MM-DD to YYYY-MM-DD format")
     
     if not input_data.get('duration') or input_data.get('duration', 0) < 1:
         errors.append("Duration must be at least 1 day")